@@ -6,3 +6,4 @@ from adbus.service import Service
 import adbus.server
 import adbus.client
 from . import exceptions
+from . import datatypes
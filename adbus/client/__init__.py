@@ -1,8 +1,12 @@
 # == Copyright: 2017, CCX Technologies
 
 from adbus.client.call import call
+from adbus.client.call import PreparedCall
+from adbus.client.call import call_many
 from adbus.client.getset import get
 from adbus.client.getset import set_
 from adbus.client.getset import get_all
 from adbus.client.listen import Listen
+from adbus.client.listen import SignalQueue
 from adbus.client.proxy import Proxy
+from adbus.client.proxy import PropertyDelta
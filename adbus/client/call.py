@@ -1,5 +1,7 @@
 # == Copyright: 2017, CCX Technologies
 
+import asyncio
+
 from .. import sdbus
 
 
@@ -13,10 +15,14 @@ async def call(
         response_signature=None,
         timeout_ms=30000,
         expect_reply=True,
+        array_type=None,
+        lazy=False,
+        arg_signature=None,
 ):
     """Calls a D-Bus Method in another process.
 
     This is a co-routine, so must be await-ed from within a asyncio mainloop.
+    Cancelling it, ie. with asyncio.wait_for, cancels the pending call.
 
     Args:
         service (adbus.server.Service): service to connect to
@@ -30,6 +36,24 @@ async def call(
             specifying it here will speed up the message post-processing
         timeout_ms (int): optional, maximum time to wait for a response in milli-seconds
         expect_reply (bool): optional, expect a method call reply
+        array_type (type): optional, type returned for arrays of fixed-width
+            types (ie. ay, ai, ad), one of list (default), bytes,
+            memoryview, array.array, or numpy.ndarray, bytes and memoryview
+            hold the raw data in native byte order, a memoryview or
+            numpy.ndarray references the response message directly so no
+            copy is made, with numpy.ndarray arrays of fixed-width structs
+            (ie. a(dd)) are returned as structured arrays
+        lazy (bool): optional, return dictionaries and arrays of
+            non-fixed-width types as read-only views on the response
+            message (adbus.sdbus.MessageDict and adbus.sdbus.MessageList),
+            values are only decoded when accessed, useful when only a few
+            entries of a large response are needed, views must be used from
+            the mainloop's thread, call materialize() on a view to
+            decode all of it
+        arg_signature (str): optional, D-Bus Signature of the arguments,
+            if None the signature will be created at run-time from the
+            arguments, specifying it here skips inspecting the arguments,
+            which for large lists can be significant
 
     """
 
@@ -40,13 +64,150 @@ async def call(
 
     call = sdbus.Call(
             service.sdbus, address.encode(), path.encode(), interface.encode(),
-            method.encode(), args, _response_signature, expect_reply
+            method.encode(), args, _response_signature, expect_reply,
+            array_type, lazy,
+            arg_signature.encode() if arg_signature is not None else None
+    )
+
+    return await call.send(timeout_ms)
+
+
+class PreparedCall:
+    """A D-Bus Method call in another process, prepared to be called
+    many times.
+
+    The header fields and signatures are encoded once, so each call only
+    has to append its arguments. Call with the method's arguments, this
+    is a co-routine, so must be await-ed from within a asyncio mainloop.
+
+    Args:
+        service (adbus.server.Service): service to connect to
+        address (str): address (name) of the D-Bus Service to call
+        path (str): path of method to call, ie. /com/awesome/Settings1
+        interface (str): interface label to call, ie. com.awesome.settings
+        method (str): name of the method to call, ie. TestMethod
+        arg_signature (str): optional, D-Bus Signature of the arguments,
+            if None the signature will be created at run-time from the
+            arguments on every call
+        response_signature (str): optional, D-Bus Signature of the expected
+            response, if None the signature will be created at run-time
+        timeout_ms (int): optional, maximum time to wait for a response in
+            milli-seconds
+        expect_reply (bool): optional, expect a method call reply
+        array_type (type): optional, type returned for arrays of fixed-width
+            types, see adbus.client.call
+        lazy (bool): optional, return views on the response, see
+            adbus.client.call
+
+    """
+
+    def __init__(
+            self,
+            service,
+            address,
+            path,
+            interface,
+            method,
+            arg_signature=None,
+            response_signature=None,
+            timeout_ms=30000,
+            expect_reply=True,
+            array_type=None,
+            lazy=False,
+    ):
+        self.timeout_ms = timeout_ms
+        self.sdbus = sdbus.PreparedCall(
+                service.sdbus, address.encode(), path.encode(),
+                interface.encode(), method.encode(),
+                arg_signature.encode() if arg_signature is not None else None,
+                b"Any" if response_signature is None else
+                response_signature.encode(), expect_reply, array_type, lazy
+        )
+
+    async def __call__(self, *args):
+        return await self.sdbus.call(args).send(self.timeout_ms)
+
+
+def _send_item(service, item, timeout_ms, array_type, lazy):
+    if isinstance(item[0], PreparedCall):
+        prepared = item[0]
+        args = tuple(item[1]) if len(item) > 1 else ()
+        return prepared.sdbus.call(args).send(prepared.timeout_ms)
+
+    address, path, interface, method = item[:4]
+    args = item[4] if len(item) > 4 else ()
+    response_signature = item[5] if len(item) > 5 else None
+
+    call = sdbus.Call(
+            service.sdbus, address.encode(), path.encode(), interface.encode(),
+            method.encode(), args, b"Any" if response_signature is None else
+            response_signature.encode(), True, array_type, lazy
     )
 
-    call.send(timeout_ms)
-    await call.event.wait()
+    return call.send(timeout_ms)
+
+
+async def call_many(
+        service,
+        calls,
+        concurrency=None,
+        timeout_ms=30000,
+        array_type=None,
+        lazy=False,
+):
+    """Calls many D-Bus Methods in other processes, pipelined.
+
+    All the calls are sent back to back without waiting for replies, then
+    the replies are gathered as they arrive, so the calls cost about one
+    round trip instead of one each.
+
+    This is a co-routine, so must be await-ed from within a asyncio mainloop.
+    Cancelling it cancels all pending calls.
+
+    Args:
+        service (adbus.server.Service): service to connect to
+        calls (iterable): calls to make, each is a tuple of
+            (address, path, interface, method, args, response_signature),
+            args and response_signature are optional, see adbus.client.call,
+            or (prepared_call, args) with a adbus.client.PreparedCall
+        concurrency (int): optional, maximum number of calls waiting for
+            a reply at one time, if None all calls are sent at once
+        timeout_ms (int): optional, maximum time to wait for each response
+            in milli-seconds, prepared calls use their own timeout
+        array_type (type): optional, type returned for arrays of fixed-width
+            types, see adbus.client.call
+        lazy (bool): optional, return views on the responses, see
+            adbus.client.call
+
+    Returns:
+        A list with the response of each call in the same order as calls,
+        if a call failed its exception is in the list instead.
+    """
+    loop = service.get_loop()
+    futures = []
+    pending = set()
+
+    try:
+        for item in calls:
+            if concurrency and (len(pending) >= concurrency):
+                _, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+            try:
+                future = _send_item(
+                        service, item, timeout_ms, array_type, lazy
+                )
+            except Exception as e:
+                future = loop.create_future()
+                future.set_exception(e)
+
+            futures.append(future)
+            pending.add(future)
+
+        return await asyncio.gather(*futures, return_exceptions=True)
 
-    if isinstance(call.response, Exception):
-        raise call.response
-    else:
-        return call.response
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
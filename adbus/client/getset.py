@@ -1,11 +1,44 @@
 # == Copyright: 2017, CCX Technologies
 
 from asyncio import wait_for
+from asyncio import shield
 from .. import sdbus
 from .. import datatypes
 
+# reads being waited on, shared by all coalesced reads of the same property
+_in_flight = {}
 
-async def get(service, address, path, interface, name, timeout_ms=30000):
+
+def _in_flight_done(key, future):
+    if _in_flight.get(key) is future:
+        del _in_flight[key]
+
+    # retrieved here, as every waiter may have been cancelled
+    if not future.cancelled():
+        future.exception()
+
+
+async def _coalesced(key, send):
+    future = _in_flight.get(key)
+
+    if future is None:
+        future = send()
+        _in_flight[key] = future
+        future.add_done_callback(lambda f: _in_flight_done(key, f))
+
+    # a waiter being cancelled mustn't cancel the call for the others
+    return await shield(future)
+
+
+async def get(
+        service,
+        address,
+        path,
+        interface,
+        name,
+        timeout_ms=30000,
+        coalesce=False
+):
     """Gets a D-Bus Property from another process.
 
     This is a co-routine, so must be await-ed from within a asyncio mainloop.
@@ -17,26 +50,34 @@ async def get(service, address, path, interface, name, timeout_ms=30000):
         interface (str): interface label to call, ie. com.awesome.settings
         name (str): name of the name to get, ie. TestProperty
         timeout_ms (int): maximum time to wait for a response in milli-seconds
+        coalesce (bool): optional, if true and the same property is already
+            being read with coalesce set, wait for that read instead of
+            sending another, all the waiters get the same value (so it
+            shouldn't be modified) or exception
 
     Returns:
         Value of the name.
     """
 
-    call = sdbus.Call(
-            service.sdbus, address.encode(), path.encode(),
-            b"org.freedesktop.DBus.Properties", b"Get", (interface, name), b"v"
-    )
+    def send():
+        call = sdbus.Call(
+                service.sdbus, address.encode(), path.encode(),
+                b"org.freedesktop.DBus.Properties", b"Get", (interface, name),
+                b"v"
+        )
+        return call.send(timeout_ms)
 
-    call.send(timeout_ms)
-    await call.event.wait()
+    if coalesce:
+        return await _coalesced(
+                (service, address, path, interface, name), send
+        )
 
-    if isinstance(call.response, Exception):
-        raise call.response
-    else:
-        return call.response
+    return await send()
 
 
-async def get_all(service, address, path, interface, timeout_ms=30000):
+async def get_all(
+        service, address, path, interface, timeout_ms=30000, coalesce=False
+):
     """Gets a All D-Bus Properties from another process.
 
     This is a co-routine, so must be await-ed from within a asyncio mainloop.
@@ -47,25 +88,28 @@ async def get_all(service, address, path, interface, timeout_ms=30000):
         path (str): path of method to call, ie. /com/awesome/Settings1
         interface (str): interface label to call, ie. com.awesome.settings
         timeout_ms (int): maximum time to wait for a response in milli-seconds
+        coalesce (bool): optional, if true and the same interface is already
+            being read with coalesce set, wait for that read instead of
+            sending another, all the waiters get the same dictionary (so it
+            shouldn't be modified) or exception
 
     Returns:
         A dictionary, keys are the name names and values are the name
         values.
     """
 
-    call = sdbus.Call(
-            service.sdbus, address.encode(), path.encode(),
-            b"org.freedesktop.DBus.Properties", b"GetAll", (interface, ),
-            b"a{sv}"
-    )
+    def send():
+        call = sdbus.Call(
+                service.sdbus, address.encode(), path.encode(),
+                b"org.freedesktop.DBus.Properties", b"GetAll", (interface, ),
+                b"a{sv}"
+        )
+        return call.send(timeout_ms)
 
-    call.send(timeout_ms)
-    await call.event.wait()
+    if coalesce:
+        return await _coalesced((service, address, path, interface), send)
 
-    if isinstance(call.response, Exception):
-        raise call.response
-    else:
-        return call.response
+    return await send()
 
 
 async def set_(
@@ -103,8 +147,4 @@ async def set_(
             )
     )
 
-    call.send(timeout_ms)
-    await call.event.wait()
-
-    if isinstance(call.response, Exception):
-        raise call.response
+    await call.send(timeout_ms)
@@ -1,20 +1,171 @@
 # == Copyright: 2017, CCX Technologies
 
 import inspect
+from collections import deque
 
 from .. import sdbus
 
+_overflow_policies = ('drop-oldest', 'drop-newest', 'keep-latest')
+
+
+class SignalQueue:
+    """Queue of received signals, waiting to be handled in order.
+
+    Args:
+        service (adbus.server.Service): service the signals are received on
+        maxsize (int): optional, maximum number of signals queued, if 0
+            there's no limit
+        overflow (str): optional, what happens when the queue is full,
+            'drop-oldest' drops the oldest queued signal, 'drop-newest'
+            drops the signal received, 'keep-latest' only keeps the
+            latest signal with the same key, dropping the oldest signal if
+            it's a new key, there's no policy to block, a signal can't be
+            held back on the bus without holding back everything else the
+            service receives, so to never drop a signal set maxsize to 0
+        key (function): optional, for keep-latest, called with the list
+            of a signal's arguments to get its key, if None the first
+            argument is the key
+        name (str): optional, name of the signal, for reporting that
+            signals were dropped
+
+    The first time a signal is dropped because the queue is full it's
+    reported to the loop's exception handler.
+    """
+
+    def __init__(
+            self,
+            service,
+            maxsize=1024,
+            overflow='drop-oldest',
+            key=None,
+            name=None
+    ):
+        if overflow not in _overflow_policies:
+            raise ValueError(
+                    f"Unknown overflow policy {overflow}, expecting"
+                    f" one of {', '.join(_overflow_policies)}"
+            )
+
+        self.service = service
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.key = key if key is not None else _first_argument
+        self.name = name
+        self.items = {} if overflow == 'keep-latest' else deque()
+        self.waiters = deque()
+
+        self.dropped = 0
+        """Number of signals dropped because the queue was full."""
+
+    def __len__(self):
+        return len(self.items)
+
+    def full(self):
+        return self.maxsize and (len(self.items) >= self.maxsize)
+
+    def put(self, args):
+        """Queue a signal's arguments, called from the service's loop."""
+        if self.overflow == 'keep-latest':
+            key = self.key(args)
+            if key in self.items:
+                self.dropped += 1
+            elif self.full():
+                del self.items[next(iter(self.items))]
+                self._overflowed()
+            self.items[key] = args
+
+        elif not self.full():
+            self.items.append(args)
+
+        elif self.overflow == 'drop-oldest':
+            self.items.popleft()
+            self.items.append(args)
+            self._overflowed()
+
+        else:
+            self._overflowed()
+            return
+
+        self._wakeup_next()
+
+    def _overflowed(self):
+        if not self.dropped:
+            self.service.get_loop().call_exception_handler(
+                    {
+                            'message':
+                            f"Signal queue{' for ' + self.name if self.name else ''}"
+                            f" is full (maxsize {self.maxsize}), dropping signals"
+                            f" with {self.overflow}"
+                    }
+            )
+        self.dropped += 1
+
+    def _wakeup_next(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def get(self):
+        """Wait for the next signal and return its arguments, can be
+        awaited by more than one task, they get signals in turn."""
+        while not self.items:
+            waiter = self.service.get_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    self.waiters.remove(waiter)
+                except ValueError:
+                    pass
+                if self.items and not waiter.cancelled():
+                    # woken then cancelled, so let another waiter have it
+                    self._wakeup_next()
+                raise
+
+        if self.overflow == 'keep-latest':
+            return self.items.pop(next(iter(self.items)))
+        return self.items.popleft()
+
+
+def _first_argument(args):
+    return args[0]
+
+
+async def _sequential(queue, coroutine, seperate_arguments, loop):
+    while True:
+        args = await queue.get()
+        try:
+            if seperate_arguments:
+                await coroutine(*args)
+            else:
+                await coroutine(args)
+        except Exception as e:
+            loop.call_exception_handler({'message': str(e), 'exception': e})
+
 
 class Listen:
     """Listens for a D-Bus Signal from another process.
 
+    By default the coroutine is scheduled as a new task for every signal
+    received. If sequential is set, or there's no coroutine, signals are
+    put in a SignalQueue instead, with sequential it's called for one
+    signal at a time in the order they're received, without a coroutine
+    the signals are read by iterating over the Listen, ie.
+    async for args in listen:
+
     Args:
         service (adbus.server.Service): service to connect to
-        address (str): address (name) of the D-Bus Service to call
+        address (str): address (name) of the D-Bus Service to call, if
+            None signals from any sender are received
         path (str): path of method to call, ie. /com/awesome/Settings1
         interface (str): interface label to call, ie. com.awesome.settings
         signal (str): name of the signal to listen to, ie. TestSignal
-        coroutine (coroutine): coroutine to schedule when signal is received
+        coroutine (coroutine): coroutine to schedule when signal is
+            received, if None signals are queued to be iterated over
         args (list or tuple): optional, list of argument values to match,
             the argument must be a string, useful for listening to property
             changes
@@ -24,6 +175,27 @@ class Listen:
             per signal argument, if defined the coroutine will be called
             with a list of arguments, if None the coroutine will be called
             with a list of types determined at run-time
+        array_type (type): optional, type passed for arrays of fixed-width
+            types (ie. ay, ai, ad), one of list (default), bytes,
+            memoryview, array.array, or numpy.ndarray, bytes and memoryview
+            hold the raw data in native byte order, a memoryview or
+            numpy.ndarray references the signal message directly so no
+            copy is made, with numpy.ndarray arrays of fixed-width structs
+            (ie. a(dd)) are passed as structured arrays
+        lazy (bool): optional, pass dictionaries and arrays of
+            non-fixed-width types as read-only views on the signal message,
+            see adbus.client.call
+        sequential (bool): optional, if True the coroutine is called for
+            one signal at a time, in order, by a single task
+        maxsize (int): optional, maximum number of signals queued, if
+            sequential or there's no coroutine, if 0 there's no limit, the
+            first signal dropped is reported to the loop's exception handler
+        overflow (str): optional, what happens when the queue is full,
+            one of 'drop-oldest' (default), 'drop-newest', or
+            'keep-latest', see SignalQueue
+        key (function): optional, for keep-latest, called with the list
+            of a signal's arguments to get its key, if None the first
+            argument is the key
     """
 
     def __init__(
@@ -36,7 +208,19 @@ class Listen:
             coroutine,
             args=(),
             signature=False,
+            array_type=None,
+            lazy=False,
+            sequential=False,
+            maxsize=1024,
+            overflow='drop-oldest',
+            key=None,
     ):
+        self.queue = None
+        self.worker = None
+
+        if coroutine is None and signature is False:
+            # there's no coroutine to get the arguments from
+            signature = None
 
         if signature is False:
             self.signature = ''
@@ -53,15 +237,56 @@ class Listen:
         else:
             self.signature = signature
 
+        handler = coroutine
+        if sequential or (coroutine is None):
+            self.queue = SignalQueue(service, maxsize, overflow, key, signal)
+            handler = self.queue.put
+
         try:
             self.sdbus = sdbus.Listen(
-                    service.sdbus, address, path, interface, signal, coroutine,
-                    args, self.signature.encode(), signature is False
+                    service.sdbus, address,
+                    path, interface, signal, handler, args,
+                    self.signature.encode(), signature is False, array_type,
+                    lazy, self.queue is not None
             )
         except sdbus.SdbusError:
             # sometimes we'll get a EINTR (like one in a million trys), we want
             # to try again if we do
             self.sdbus = sdbus.Listen(
-                    service.sdbus, address, path, interface, signal, coroutine,
-                    args, self.signature.encode(), signature is False
+                    service.sdbus, address,
+                    path, interface, signal, handler, args,
+                    self.signature.encode(), signature is False, array_type,
+                    lazy, self.queue is not None
+            )
+
+        if sequential and (coroutine is not None):
+            loop = service.get_loop()
+            self.worker = loop.create_task(
+                    _sequential(
+                            self.queue, coroutine, signature is False, loop
+                    )
             )
+
+    @property
+    def dropped(self):
+        """Number of signals dropped because the queue was full."""
+        return self.queue.dropped if self.queue is not None else 0
+
+    def __aiter__(self):
+        if self.queue is None or self.worker is not None:
+            raise TypeError("Only a Listen without a coroutine is iterable")
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def close(self):
+        """Stop listening."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.sdbus = None
+
+    def __del__(self):
+        if self.worker is not None:
+            self.worker.cancel()
@@ -7,6 +7,8 @@ import typing
 from .. import sdbus
 from .. import exceptions
 from . import call
+from . import PreparedCall
+from . import call_many
 from . import get
 from . import get_all
 from . import set_
@@ -24,6 +26,43 @@ class _DbusWrapper:
         self.dbus_value = value
 
 
+class PropertyDelta:
+    """Changes to a dictionary or list property, sent by a server that
+    publishes deltas, see adbus.server.Property.
+
+    Attributes:
+        version (int): property's version after the change
+        changed (dict): changed entries, by key, or by index for lists
+        removed (list): keys removed from a dictionary
+        length (int): length of a list, None for dictionaries
+        in_place (bool): if True the value was changed in place, so there
+            are no changes, and the value has to be read
+    """
+
+    def __init__(
+            self, version, changed, removed=(), length=None, in_place=False
+    ):
+        self.version = version
+        self.changed = changed
+        self.removed = removed
+        self.length = length
+        self.in_place = in_place
+
+    def apply(self, value):
+        """Apply the changes to a value, in place."""
+        if self.length is None:
+            value.update(self.changed)
+            for key in self.removed:
+                value.pop(key, None)
+        else:
+            del value[self.length:]
+            for i in sorted(self.changed):
+                if i < len(value):
+                    value[i] = self.changed[i]
+                else:
+                    value.append(self.changed[i])
+
+
 class Signal:
 
     def __init__(
@@ -44,7 +83,17 @@ class Signal:
             if x.tag == 'arg':
                 self.signature += x.attrib['type']
 
-    def add(self, coroutine, signature=False):
+    def add(
+            self,
+            coroutine,
+            signature=False,
+            array_type=None,
+            lazy=False,
+            sequential=False,
+            maxsize=1024,
+            overflow='drop-oldest',
+            key=None
+    ):
         """Add a listening coroutine to this signal.
 
         Args:
@@ -55,6 +104,20 @@ class Signal:
                 per signal argument, if defined the coroutine will be called
                 with a list of arguments, if None the coroutine will be called
                 with a list of types determined at run-time
+            array_type (type): optional, type passed for arrays of
+                fixed-width types (ie. ay, ai, ad), one of list (default),
+                bytes, memoryview, array.array, or numpy.ndarray
+            lazy (bool): optional, pass dictionaries and arrays of
+                non-fixed-width types as read-only views on the signal
+                message, see adbus.client.call
+            sequential (bool): optional, if True the coroutine is called for
+                one signal at a time, in order, see adbus.client.Listen
+            maxsize (int): optional, maximum number of signals queued if
+                sequential, if 0 there's no limit
+            overflow (str): optional, what happens when the queue is full,
+                see adbus.client.SignalQueue
+            key (function): optional, for keep-latest, called with the list
+                of a signal's arguments to get its key
         """
         listen = Listen(
                 self.service,
@@ -63,9 +126,62 @@ class Signal:
                 self.interface,
                 self.name,
                 coroutine,
-                signature=signature
+                signature=signature,
+                array_type=array_type,
+                lazy=lazy,
+                sequential=sequential,
+                maxsize=maxsize,
+                overflow=overflow,
+                key=key
         )
+        self.check_signature(listen)
 
+        self.listens[coroutine.__name__] = listen
+
+    def subscribe(
+            self,
+            maxsize=1024,
+            overflow='drop-oldest',
+            key=None,
+            array_type=None,
+            lazy=False
+    ):
+        """Subscribe to this signal, to iterate over the signals received.
+
+        Args:
+            maxsize (int): optional, maximum number of signals queued, if 0
+                there's no limit
+            overflow (str): optional, what happens when the queue is full,
+                see adbus.client.SignalQueue
+            key (function): optional, for keep-latest, called with the list
+                of a signal's arguments to get its key
+            array_type (type): optional, type passed for arrays of
+                fixed-width types, see add
+            lazy (bool): optional, pass dictionaries and arrays of
+                non-fixed-width types as read-only views on the signal
+                message, see adbus.client.call
+
+        Returns:
+            adbus.client.Listen, iterate over it to get a list of each
+            signal's arguments, ie. async for args in subscription:
+            the signal is listened for until it's closed
+        """
+        return Listen(
+                self.service,
+                self.address,
+                self.path,
+                self.interface,
+                self.name,
+                None,
+                signature=self.signature,
+                array_type=array_type,
+                lazy=lazy,
+                maxsize=maxsize,
+                overflow=overflow,
+                key=key
+        )
+
+    def check_signature(self, listen):
         if (
                 (listen.signature != 'ANY')
                 and (self.signature != listen.signature)
@@ -75,8 +191,6 @@ class Signal:
                     f"match signal signature {self.signature}."
             )
 
-        self.listens[coroutine.__name__] = listen
-
     def remove(self, coroutine):
         del self.listens[coroutine.__name__]
 
@@ -92,7 +206,15 @@ class Property:
     cached_value = None
 
     def __init__(
-            self, parent, service, address, path, interface, etree, timeout_ms
+            self,
+            parent,
+            service,
+            address,
+            path,
+            interface,
+            etree,
+            timeout_ms,
+            coalesce=False
     ):
         self.parent = parent
         self.service = service
@@ -100,9 +222,14 @@ class Property:
         self.path = path
         self.interface = interface
         self.timeout_ms = timeout_ms
+        self.coalesce = coalesce
         self.name = etree.attrib['name']
         self.signature = etree.attrib['type']
         self.trackers = {}
+        self.delta_trackers = {}
+        self.delta_listen = None
+        self.version = None
+        self.resync_deltas = None
 
         if etree.attrib['access'] == 'readwrite':
             self.readonly = False
@@ -122,17 +249,35 @@ class Property:
                 (self.emits_changed_signal == 'false')
                 or (self.cached_value is None)
         ):
-            self.cached_value = await get(
-                    self.service,
-                    self.address,
-                    self.path,
-                    self.interface,
-                    self.name,
-                    timeout_ms=self.timeout_ms
-            )
+            if self.delta_listen is not None:
+                self.version, self.cached_value = await self.get_versioned()
+            else:
+                self.cached_value = await get(
+                        self.service,
+                        self.address,
+                        self.path,
+                        self.interface,
+                        self.name,
+                        timeout_ms=self.timeout_ms,
+                        coalesce=self.coalesce
+                )
 
         return self.cached_value
 
+    async def get_versioned(self):
+        """Read the value of a property the server publishes deltas for,
+        with its version."""
+        version, value = await get(
+                self.service,
+                self.address,
+                self.path,
+                self.interface,
+                self.name + 'Versioned',
+                timeout_ms=self.timeout_ms,
+                coalesce=self.coalesce
+        )
+        return version, value
+
     async def set(self, value):
         if self.emits_changed_signal == 'const':
             raise AttributeError(f"Can't set read-only property {self.name}")
@@ -162,11 +307,120 @@ class Property:
                         timeout_ms=self.timeout_ms
                 )
 
-    def track(self, coroutine):
-        self.trackers[coroutine.__name__] = coroutine
+    def track(self, coroutine, delta=False):
+        """Call a coroutine when the property changes.
+
+        Args:
+            coroutine (coroutine): called with the new value
+            delta (bool): optional, if True and the server publishes
+                deltas for this property the coroutine is called with an
+                adbus.client.PropertyDelta for each change instead, and
+                with the new value when the cache is re-synchronized
+        """
+        if delta:
+            self.delta_trackers[coroutine.__name__] = coroutine
+        else:
+            self.trackers[coroutine.__name__] = coroutine
 
     def untrack(self, coroutine):
-        del self.trackers[coroutine.__name__]
+        self.trackers.pop(coroutine.__name__, None)
+        self.delta_trackers.pop(coroutine.__name__, None)
+
+    def delta_signature(self):
+        """Signature of the delta signal a server publishes for this
+        property, None if it can't publish deltas."""
+        if self.signature.startswith('a{'):
+            return 'x' + self.signature + 'a' + self.signature[2]
+        if self.signature.startswith('a'):
+            return 'xxa{x' + self.signature[1:] + '}'
+        return None
+
+    def listen_deltas(self):
+        self.delta_listen = Listen(
+                self.service,
+                self.address,
+                self.path,
+                self.interface,
+                self.name + 'Delta',
+                self.delta_changed,
+                signature=self.delta_signature(),
+        )
+
+    async def delta_changed(self, values):
+        # a negative version is sent if it was changed in place
+        version = abs(values[0])
+        in_place = values[0] < 0
+
+        if self.signature.startswith('a{'):
+            delta = PropertyDelta(
+                    version, values[1], removed=values[2], in_place=in_place
+            )
+        else:
+            delta = PropertyDelta(
+                    version, values[2], length=values[1], in_place=in_place
+            )
+
+        if self.resync_deltas is not None:
+            self.resync_deltas.append(delta)
+            return
+
+        if self.cached_value is None:
+            # not cached, it will be read when it's next accessed
+            self.version = None
+            return
+
+        # if the value was read without its version the deltas already
+        # in it aren't known, so it's read again
+        if (
+                delta.in_place or (self.version is None)
+                or (delta.version != self.version + 1)
+        ):
+            await self.resync(delta)
+            return
+
+        delta.apply(self.cached_value)
+        self.version = delta.version
+
+        for coroutine in self.trackers.values():
+            await coroutine(self.cached_value)
+        for coroutine in self.delta_trackers.values():
+            await coroutine(delta)
+
+    async def resync(self, delta):
+        """A delta can't be applied, read the whole value, and its
+        version."""
+        self.resync_deltas = [delta]
+        try:
+            while True:
+                version, value = await self.get_versioned()
+
+                # deltas received while reading that aren't in the value
+                deltas = [d for d in self.resync_deltas if d.version > version]
+                self.resync_deltas = []
+
+                if all(
+                        (not d.in_place) and (d.version == version + i + 1)
+                        for i, d in enumerate(deltas)
+                ):
+                    break
+
+            for delta in deltas:
+                delta.apply(value)
+                version = delta.version
+        except Exception:
+            self.cached_value = None
+            self.version = None
+            raise
+        else:
+            self.cached_value = value
+            self.version = version
+        finally:
+            self.resync_deltas = None
+
+        for coroutine in self.trackers.values():
+            await coroutine(self.cached_value)
+        for coroutine in self.delta_trackers.values():
+            await coroutine(self.cached_value)
 
     async def __call__(self, value=None):
         if value is None:
@@ -189,6 +443,7 @@ class Method:
         self.timeout_ms = timeout_ms
         self.arg_signatures = []
         self.return_signature = ''
+        self.array_type = None
 
         for x in etree.iter():
             if x.tag == 'method':
@@ -199,28 +454,48 @@ class Method:
                 elif x.attrib['direction'] == 'in':
                     self.arg_signatures.append(x.attrib['type'])
 
-    async def __call__(self, *args):
-        return await call(
+        self._prepare()
+
+    def _prepare(self):
+        self.prepared = PreparedCall(
                 self.service,
                 self.address,
                 self.path,
                 self.interface,
-                self.name, [
-                        _DbusWrapper(
-                                self.arg_signatures[i],
-                                sdbus.dbus_cast(self.arg_signatures[i], a)
-                        ) for i, a in enumerate(args)
-                ],
+                self.name,
+                ''.join(self.arg_signatures),
                 self.return_signature,
-                timeout_ms=self.timeout_ms
+                timeout_ms=self.timeout_ms,
+                array_type=self.array_type
         )
 
+    async def __call__(self, *args):
+        return await self.prepared(*args)
+
+    def set_array_type(self, array_type):
+        """Set the type returned for arrays of fixed-width types.
+
+        Args:
+            array_type (type): one of list (default), bytes, memoryview,
+                array.array, or numpy.ndarray, see adbus.client.call
+        """
+        self.array_type = array_type
+        self._prepare()
+
 
 class Interface:
 
     def __init__(
-            self, parent, service, address, path, etree, camel_convert,
-            timeout_ms, changed_coroutine
+            self,
+            parent,
+            service,
+            address,
+            path,
+            etree,
+            camel_convert,
+            timeout_ms,
+            changed_coroutine,
+            coalesce=False
     ):
         self.parent = parent
         interface = etree.attrib['name']
@@ -236,6 +511,7 @@ class Interface:
         self.path = path
         self.interface = interface
         self.timeout_ms = timeout_ms
+        self.coalesce = coalesce
 
         def _add_snake_and_camel(d, n, v):
             d[n] = v
@@ -256,7 +532,7 @@ class Interface:
                     self.properties, p.attrib['name'],
                     Property(
                             self, service, address, path, interface, p,
-                            timeout_ms
+                            timeout_ms, coalesce
                     )
             )
 
@@ -283,15 +559,38 @@ class Interface:
                     )
             )
 
+        for name, prop in self.properties.items():
+            # properties with a delta signal are updated from it
+            try:
+                signal = self.signals[name + 'Delta']
+            except KeyError:
+                continue
+            if (
+                    (prop.delta_listen is None)
+                    and (signal.signature == prop.delta_signature())
+                    and (name + 'Versioned' in self.properties)
+            ):
+                prop.listen_deltas()
+
     async def update_properties(self):
         if self.properties_changed_listen is not None:
             values = await get_all(
-                    self.service, self.address, self.path, self.interface,
-                    self.timeout_ms
+                    self.service,
+                    self.address,
+                    self.path,
+                    self.interface,
+                    self.timeout_ms,
+                    coalesce=self.coalesce
             )
             for p, v in values.items():
                 self.properties[p].cached_value = v
 
+            # GetAll doesn't include the versions, so the deltas already in
+            # these values aren't known, the next delta re-reads the value
+            for prop in self.properties.values():
+                if prop.delta_listen is not None:
+                    prop.version = None
+
     async def properties_changed(
             self, interface: str, changed: typing.Dict[str, typing.Any],
             invalidated: typing.List[str]
@@ -303,7 +602,9 @@ class Interface:
                 await coroutine(v)
 
         for p in invalidated:
-            self.properties[p].cached_value = None
+            prop = self.properties[p]
+            if prop.delta_listen is None:
+                prop.cached_value = None
 
         if self.changed_coroutine:
             changed = list(changed.keys()) + invalidated
@@ -345,6 +646,25 @@ class Interface:
         """Set the Interface's Changed Co-Routine."""
         self.changed_coroutine = changed_coroutine
 
+    async def call_many(self, calls, concurrency=None):
+        """Call many of this Interface's methods, pipelined.
+
+        Args:
+            calls (iterable): calls to make, each is a tuple of
+                (method, args), method is the method's name
+            concurrency (int): optional, maximum number of calls waiting
+                for a reply at one time, if None all calls are sent at once
+
+        Returns:
+            A list with the response of each call in the same order as
+            calls, if a call failed its exception is in the list instead.
+        """
+        return await call_many(
+                self.service,
+                [(self.methods[name].prepared, args) for name, args in calls],
+                concurrency=concurrency
+        )
+
     async def __aenter__(self):
         self._property_multi = _Empty_Class()
         return self._property_multi
@@ -392,6 +712,9 @@ class Proxy:
             methods and arguments are typically defined in Snake
             Case, if this is set the cases will be automatically
             converted between the two
+        coalesce (bool): optional, if true reading a property that's already
+            being read waits for that read instead of sending another,
+            see adbus.client.get
 
     """
 
@@ -407,6 +730,7 @@ class Proxy:
             changed_coroutines=None,
             timeout_ms=30000,
             camel_convert=True,
+            coalesce=False,
     ):
         self._node_i = 0
         self._interfaces = {}
@@ -425,6 +749,7 @@ class Proxy:
             self._changed_coroutines = {}
         self._timeout_ms = timeout_ms
         self._camel_convert = camel_convert
+        self._coalesce = coalesce
 
     def __getattr__(self, name):
         if self._introspect_xml is None:
@@ -449,7 +774,8 @@ class Proxy:
 
         new = type(self)(
                 self._service, self._address, f"{self._path}/{node}", None,
-                changed_coroutines, self._timeout_ms, self._camel_convert
+                changed_coroutines, self._timeout_ms, self._camel_convert,
+                self._coalesce
         )
 
         await new.update()
@@ -507,7 +833,7 @@ class Proxy:
             self._interfaces[name] = Interface(
                     self, self._service, self._address, self._path, e,
                     self._camel_convert, self._timeout_ms,
-                    self._changed_coroutines.get(name, None)
+                    self._changed_coroutines.get(name, None), self._coalesce
             )
 
         for e in root.iter('node'):
@@ -1,5 +1,9 @@
 # == Copyright: 2017, CCX Technologies
 
+import os
+import mmap
+import fcntl
+
 
 class VariantWrapper:
     """Creates a D-Bus Variant from any value.
@@ -11,3 +15,158 @@ class VariantWrapper:
         self.dbus_value_signature = signature
         self.dbus_value = value
         self.value = value
+
+
+class UnixFd:
+    """Unix File Descriptor, D-Bus type 'h'.
+
+    Owns the file descriptor, it's closed when this object is closed or
+    garbage collected. Received file descriptors are passed as UnixFd
+    objects, when sending the descriptor is duplicated by sd-bus so
+    this object can be closed as soon as the message is sent.
+
+    Can also be used as a type annotation for methods and signals.
+
+    Args:
+        fd (int or object): file descriptor or an object with a
+            fileno method, ie. a file
+        dup (bool): optional, if true (default) the file descriptor is
+            duplicated, otherwise this object takes ownership of it
+    """
+    dbus_signature = "h"
+
+    def __init__(self, fd, dup=True):
+        if not isinstance(fd, int):
+            fd = fd.fileno()
+        self._fd = os.dup(fd) if dup else fd
+
+    @property
+    def dbus_value(self):
+        return self.fileno()
+
+    @property
+    def closed(self):
+        return self._fd < 0
+
+    def fileno(self):
+        """The file descriptor, still owned by this object."""
+        if self._fd < 0:
+            raise ValueError("File descriptor is closed")
+        return self._fd
+
+    def detach(self):
+        """Release ownership of the file descriptor, and return it."""
+        fd = self.fileno()
+        self._fd = -1
+        return fd
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, exception_traceback):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._fd})"
+
+
+def _check_memfd():
+    # os.memfd_create and the fcntl seals were added in Python 3.8
+    if not (hasattr(os, 'memfd_create') and hasattr(fcntl, 'F_ADD_SEALS')):
+        raise NotImplementedError("Memfd requires Python 3.8 or newer")
+
+
+class Memfd(UnixFd):
+    """Sealed memory file, for passing large payloads by file descriptor.
+
+    The payload is written to an anonymous memory file (memfd) which is
+    sealed so it can never be modified, only the file descriptor goes
+    through the D-Bus and the receiver maps the memory read-only, so
+    the data is never copied through the bus daemon.
+
+    Sender, create from the payload and send as an argument or return
+    value (D-Bus type 'h')::
+
+        return adbus.datatypes.Memfd.create(image)
+
+    Receiver, wrap the received UnixFd and map it::
+
+        data = adbus.datatypes.Memfd(fd).map()
+
+    Args:
+        fd (int or object): file descriptor of a sealed memfd or an
+            object with a fileno method, ie. a received UnixFd
+        dup (bool): optional, if true (default) the file descriptor is
+            duplicated, otherwise this object takes ownership of it
+    """
+
+    @classmethod
+    def create(cls, data, name="adbus"):
+        """Create a sealed memfd holding a copy of data.
+
+        Args:
+            data (bytes-like): payload, any object supporting the
+                buffer protocol
+            name (str): optional, name of the memfd, only used
+                for debugging (ie. shown in /proc/<pid>/fd)
+
+        Returns:
+            A new Memfd.
+
+        Raises:
+            NotImplementedError: if memfds aren't supported, they
+                require Python 3.8 or newer
+        """
+        _check_memfd()
+        seals = (
+                fcntl.F_SEAL_SEAL | fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_GROW
+                | fcntl.F_SEAL_WRITE
+        )
+
+        fd = os.memfd_create(name, os.MFD_CLOEXEC | os.MFD_ALLOW_SEALING)
+        try:
+            view = memoryview(data).cast('B')
+            while view:
+                view = view[os.write(fd, view):]
+            fcntl.fcntl(fd, fcntl.F_ADD_SEALS, seals)
+        except BaseException:
+            os.close(fd)
+            raise
+        return cls(fd, dup=False)
+
+    def map(self):
+        """Map the payload read-only.
+
+        Returns:
+            A read-only memoryview of the payload.
+
+        Raises:
+            ValueError: if the file isn't sealed, the sender could
+                modify or truncate it while it's mapped
+            NotImplementedError: if memfds aren't supported, they
+                require Python 3.8 or newer
+        """
+        _check_memfd()
+        fd = self.fileno()
+
+        try:
+            seals = fcntl.fcntl(fd, fcntl.F_GET_SEALS)
+        except OSError:
+            seals = 0
+        required = fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_WRITE
+        if (seals & required) != required:
+            raise ValueError("Memory file must be sealed against writes")
+
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return memoryview(b'')
+
+        return memoryview(mmap.mmap(fd, size, access=mmap.ACCESS_READ))
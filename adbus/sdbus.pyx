@@ -2,14 +2,24 @@
 #cython: language_level=3
 
 import re
+import sys
 from adbus cimport sdbus_h
+cimport cython
 
 from typing import _GenericAlias
 from typing import Any
 from asyncio import get_event_loop
-from asyncio import Event
 from asyncio import wait_for
 from asyncio import ensure_future
+from asyncio import get_running_loop
+from asyncio import CancelledError
+from inspect import iscoroutinefunction
+from functools import partial
+from weakref import ref
+from collections import deque
+from collections.abc import Mapping
+from collections.abc import Sequence
+from array import array
 from errno import errorcode
 from libc cimport stdint
 from libc cimport stdio
@@ -19,11 +29,24 @@ from libc.string cimport memcpy
 from libc.string cimport strncpy
 from libc.string cimport strlen
 from libc.string cimport memset
+from posix.time cimport clock_gettime
+from posix.time cimport timespec
+from posix.time cimport CLOCK_MONOTONIC
 from cpython.ref cimport PyObject
 from cpython.ref cimport Py_INCREF
 from cpython.ref cimport Py_DECREF
 from cpython cimport bool
+from cpython.buffer cimport PyBUF_WRITABLE
+from cpython.buffer cimport PyBUF_FORMAT
+from cpython.buffer cimport PyBUF_ND
+from cpython.buffer cimport PyBUF_STRIDES
+from cpython.buffer cimport PyBUF_C_CONTIGUOUS
+from cpython.buffer cimport PyObject_CheckBuffer
+from cpython.buffer cimport PyObject_GetBuffer
+from cpython.buffer cimport PyBuffer_Release
+from libc.errno cimport EOPNOTSUPP
 from .exceptions import BusError
+from .datatypes import UnixFd
 
 cdef class SdbusError(Exception):
     """SD-Bus Library Configuration Error"""
@@ -34,7 +57,9 @@ cdef class SdbusError(Exception):
 
 include "sdbus/snake.pxi"
 include "sdbus/signature.pxi"
+include "sdbus/plan.pxi"
 include "sdbus/message.pxi"
+include "sdbus/lazy.pxi"
 include "sdbus/error.pxi"
 include "sdbus/service.pxi"
 include "sdbus/object.pxi"
@@ -6,69 +6,197 @@ cdef int call_callback(sdbus_h.sd_bus_message *m, void *userdata,
     cdef PyObject *call_ptr = <PyObject*>userdata
     cdef Call call = <Call>call_ptr
     cdef Message message = Message()
-    cdef int errcode
+    cdef int errcode = 0
 
     try:
         message.import_sd_bus_message(m)
-        response = message.read(call.response_signature)
+        message.array_mode = call.array_mode
+        if call.lazy:
+            response = _read_lazy(message, call.response_signature)
+        else:
+            response = message.read(call.response_signature)
         if len(response) == 1:
             call.response = response[0]
         elif len(response) == 0:
             call.response = None
         else:
             call.response = response
-        return 0
 
     except SdbusError as e:
         call.response = e
         errcode = <int>e.errno
-        return -errcode
+
+    except Exception as e:
+        call.response = e
 
     finally:
-        call.wake()
-        Py_DECREF(call)
+        call.complete()
+
+    return -errcode
+
+cdef _append_arguments(Message message, list plan, object args):
+    cdef Node node
+
+    if len(plan) != len(args):
+        raise SdbusError(f"Signature {b''.join([(<Node>n).signature for n in plan])} "
+                f"doesn't match {len(args)} arguments")
+
+    for node, arg in zip(plan, args):
+        message._append_node(node, arg)
 
 cdef class Call:
     cdef Message message
     cdef Service service
-    cdef public object event
+    cdef public object future
     cdef public object response
-    cdef object wait_co
-    cdef char *response_signature
+    cdef sdbus_h.sd_bus_slot *slot
+    cdef bytes response_signature
     cdef bint expect_reply
+    cdef int array_mode
+    cdef bint lazy
 
-    def __cinit__(self, Service service, address, path, interface, method,
-            args=None, response_signature=b'', expect_reply=True):
+    def __cinit__(self, *args, **kwargs):
+        self.response = None
+        self.slot = NULL
+
+    def __dealloc__(self):
+        self.slot = sdbus_h.sd_bus_slot_unref(self.slot)
+
+    def __init__(self, Service service, address, path, interface, method,
+            args=None, response_signature=b'', expect_reply=True,
+            array_type=None, lazy=False, arg_signature=None):
 
-        self.event = Event()
         self.service = service
-        self.response = None
         self.message = Message()
         self.message.new_method_call(service, address, path, interface, method, expect_reply)
         self.expect_reply = expect_reply
         self.response_signature = response_signature
+        self.array_mode = _array_mode(array_type)
+        self.lazy = lazy
+
+        if args and arg_signature:
+            # a declared signature skips inferring one from every argument
+            _append_arguments(self.message, _signature_plan(arg_signature),
+                    args)
 
-        if args:
+        elif args:
             for arg in args:
                 signature = _dbus_signature(arg)
                 self.message.append(signature, arg)
 
     def send(self, stdint.uint64_t timout_ms):
+        """Send the call.
+
+        Returns:
+            An asyncio Future of the response, cancelling it cancels
+            the call.
+        """
         cdef int ret
-        self.event.clear()
+
+        self.future = self.service.loop.create_future()
 
         if self.expect_reply:
-            Py_INCREF(self)
-            ret = sdbus_h.sd_bus_call_async(self.service.bus, NULL,
+            ret = sdbus_h.sd_bus_call_async(self.service.bus, &self.slot,
                     self.message.message, call_callback, <void *>self,
                     timout_ms*1000)
             if ret < 0:
-                Py_DECREF(self)
-                self.event.set()
+                self.future = None
                 raise SdbusError(f"Failed to send call: {errorcode[-ret]}", -ret)
+
+            # held by the pending call, until the reply or it's cancelled
+            Py_INCREF(self)
+            self.future.add_done_callback(self._future_done)
+
         else:
             self.message.send()
-            self.event.set()
+            self.future.set_result(None)
+
+        self.service.sent()
+
+        return self.future
+
+    cdef complete(self):
+        # the slot is only referenced by the bus while the callback runs,
+        # releasing it here frees it as soon as the callback returns
+        self.slot = sdbus_h.sd_bus_slot_unref(self.slot)
+
+        if not self.future.done():
+            if isinstance(self.response, Exception):
+                self.future.set_exception(self.response)
+            else:
+                self.future.set_result(self.response)
+
+        Py_DECREF(self)
+
+    def _future_done(self, future):
+        if self.slot != NULL:
+            # cancelled, releasing the slot removes the pending call
+            # from sd-bus so the callback will never be called
+            self.slot = sdbus_h.sd_bus_slot_unref(self.slot)
+            Py_DECREF(self)
+
+cdef class PreparedCall:
+    """Method call with its header fields and signatures encoded once,
+    creates a Call for every set of arguments."""
+    cdef Service service
+    cdef bytes address
+    cdef bytes path
+    cdef bytes interface
+    cdef bytes method
+    cdef list arg_plan
+    cdef bytes response_signature
+    cdef bint expect_reply
+    cdef int array_mode
+    cdef bint lazy
+
+    def __cinit__(self, Service service, address, path, interface, method,
+            arg_signature=None, response_signature=b'', expect_reply=True,
+            array_type=None, lazy=False):
+
+        self.service = service
+        self.address = address
+        self.path = path
+        self.interface = interface
+        self.method = method
+        self.arg_plan = _signature_plan(arg_signature) \
+                if arg_signature is not None else None
+        self.response_signature = response_signature
+        self.expect_reply = expect_reply
+        self.array_mode = _array_mode(array_type)
+        self.lazy = lazy
+
+    cdef Message _new_message(self):
+        cdef Message message = Message()
+        message.new_method_call(self.service, self.address, self.path,
+                self.interface, self.method, self.expect_reply)
+        return message
+
+    def call(self, tuple args):
+        """Create a Call with these arguments, ready to send."""
+        cdef Call call = Call.__new__(Call)
+        cdef Node node
+
+        call.service = self.service
+        call.expect_reply = self.expect_reply
+        call.response_signature = self.response_signature
+        call.array_mode = self.array_mode
+        call.lazy = self.lazy
+        call.message = self._new_message()
+
+        if self.arg_plan is None:
+            for arg in args:
+                signature = _dbus_signature(arg)
+                call.message.append(signature, arg)
+            return call
+
+        try:
+            _append_arguments(call.message, self.arg_plan, args)
+        except (TypeError, ValueError, OverflowError):
+            # loosely typed arguments, ie. a float for an integer, are
+            # cast to the declared types, only needed if they don't append
+            call.message = self._new_message()
+            _append_arguments(call.message, self.arg_plan, [
+                    _object_cast((<Node>node).signature, arg)
+                    for node, arg in zip(self.arg_plan, args)])
 
-    cdef wake(self):
-        self.event.set()
+        return call
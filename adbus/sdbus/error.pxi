@@ -4,7 +4,7 @@
 cdef class Error:
     cdef sdbus_h.sd_bus_error _e
 
-    cdef reply_from_exception(self, Message call, Exception exception):
+    cdef reply_from_exception(self, Message call, object exception):
         cdef int errno
         cdef int ret
 
@@ -14,6 +14,11 @@ cdef class Error:
 
         cdef bytes err_message = str(exception).encode('utf-8')
 
+        self.reply(call, err_name, err_message)
+
+    cdef reply(self, Message call, bytes err_name, bytes err_message):
+        cdef int ret
+
         sdbus_h.sd_bus_error_set(&self._e, err_name, err_message)
         ret = sdbus_h.sd_bus_reply_method_error(call.message, &self._e)
         if ret < 0:
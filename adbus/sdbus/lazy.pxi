@@ -0,0 +1,383 @@
+# == Copyright: 2023, CCX Technologies
+#cython: language_level=3
+
+# Lazy views keep a received message referenced and only decode the parts
+# of it that are accessed. sd-bus reads messages sequentially, so an
+# access rewinds the message and skips (without decoding) along the view's
+# path from the start of the message to the value, unless it's further
+# along the view than the last one, and the message hasn't been read from
+# since, then it carries on from there, so accessing in order is linear.
+# A signal's listens each wrap the message, and share its ReadPosition.
+
+cdef enum:
+    STEP_ARGUMENT = 0
+    STEP_ELEMENT = 1
+    STEP_ENTRY = 2
+    STEP_FIELD = 3
+    STEP_VARIANT = 4
+
+cdef class Step:
+    """One step of the path from the start of a message to a value."""
+    cdef int kind
+    cdef Py_ssize_t index
+    cdef Node node
+
+cdef Step _step(int kind, Py_ssize_t index, Node node):
+    cdef Step step = Step()
+    step.kind = kind
+    step.index = index
+    step.node = node
+    return step
+
+cdef _skip(Message message, bytes signature):
+    cdef int ret
+    ret = sdbus_h.sd_bus_message_skip(message.message, signature)
+    if ret < 0:
+        raise SdbusError(f"Failed to skip {signature}: {errorcode[-ret]}", -ret)
+
+cdef _enter(Message message, char type, bytes contents):
+    cdef int ret
+    ret = sdbus_h.sd_bus_message_enter_container(message.message, type,
+            contents)
+    if ret < 0:
+        raise SdbusError(f"Failed to enter {chr(type)} {contents}: {errorcode[-ret]}",
+                -ret)
+
+cdef _enter_variant(Message message):
+    cdef int ret
+    ret = sdbus_h.sd_bus_message_enter_container(message.message,
+            sdbus_h.SD_BUS_TYPE_VARIANT, NULL)
+    if ret < 0:
+        raise SdbusError(f"Failed to enter variant: {errorcode[-ret]}", -ret)
+
+cdef _exit(Message message):
+    cdef int ret
+    ret = sdbus_h.sd_bus_message_exit_container(message.message)
+    if ret < 0:
+        raise SdbusError(f"Failed to exit container: {errorcode[-ret]}", -ret)
+
+cdef _navigate(Message message, list plan, tuple path):
+    cdef Step step
+    cdef Node element
+    cdef Py_ssize_t i
+    cdef int ret
+
+    ret = sdbus_h.sd_bus_message_rewind(message.message, 1)
+    if ret < 0:
+        raise SdbusError(f"Failed to rewind message: {errorcode[-ret]}", -ret)
+    message.position.navigations += 1
+
+    for step in path:
+        if step.kind == STEP_ARGUMENT:
+            for i in range(step.index):
+                _skip(message, (<Node>plan[i]).signature)
+
+        elif step.kind == STEP_ELEMENT:
+            element = step.node.children[0]
+            _enter(message, sdbus_h.SD_BUS_TYPE_ARRAY, step.node.contents)
+            for i in range(step.index):
+                _skip(message, element.signature)
+
+        elif step.kind == STEP_ENTRY:
+            element = step.node.children[0]
+            _enter(message, sdbus_h.SD_BUS_TYPE_ARRAY, step.node.contents)
+            for i in range(step.index):
+                _skip(message, element.signature)
+            _enter(message, sdbus_h.SD_BUS_TYPE_DICT_ENTRY, element.contents)
+            _skip(message, (<Node>element.children[0]).signature)
+
+        elif step.kind == STEP_FIELD:
+            _enter(message, sdbus_h.SD_BUS_TYPE_STRUCT, step.node.contents)
+            for i in range(step.index):
+                _skip(message, (<Node>step.node.children[i]).signature)
+
+        elif step.kind == STEP_VARIANT:
+            _enter_variant(message)
+
+cdef object _lazy_value(Message message, list plan, tuple path, Node node):
+    # reads the value at the current position, containers are returned
+    # as views and skipped, so the message is left after the value
+    cdef Node element
+    cdef Node child
+    cdef list fields
+    cdef object value
+    cdef Py_ssize_t i
+    cdef const char *esignature
+
+    if node.type == sdbus_h.SD_BUS_TYPE_ARRAY:
+        element = node.children[0]
+        if element.fixed:
+            # already read without creating an object per element
+            return message._read_node(node)
+        elif element.type == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
+            value = MessageDict()
+        else:
+            value = MessageList()
+        (<MessageView>value).init_view(message, plan, path, node)
+        _skip(message, node.signature)
+        return value
+
+    elif node.type == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN:
+        fields = []
+        _enter(message, sdbus_h.SD_BUS_TYPE_STRUCT, node.contents)
+        for i, child in enumerate(node.children):
+            fields.append(_lazy_value(message, plan,
+                    path + (_step(STEP_FIELD, i, node),), child))
+        _exit(message)
+        return tuple(fields)
+
+    elif node.type == sdbus_h.SD_BUS_TYPE_VARIANT:
+        _enter_variant(message)
+        esignature = sdbus_h.sd_bus_message_get_signature(message.message, 0)
+        value = _lazy_value(message, plan,
+                path + (_step(STEP_VARIANT, 0, None),),
+                _signature_plan(esignature)[0])
+        _exit(message)
+        return value
+
+    return message._read_node(node)
+
+cdef list _read_lazy(Message message, const char *signature):
+    cdef list plan
+    cdef list values = []
+    cdef Py_ssize_t i
+    cdef Node node
+
+    if signature[0] == b'A':
+        signature = sdbus_h.sd_bus_message_get_signature(message.message, 0)
+
+    plan = _signature_plan(signature)
+    for i, node in enumerate(plan):
+        values.append(_lazy_value(message, plan,
+                (_step(STEP_ARGUMENT, i, None),), node))
+
+    return values
+
+cdef class MessageView:
+    """Base of the lazy views on a received message.
+
+    Views must be used from the thread that received the message, they
+    share the message's read position.
+    """
+    cdef Message message
+    cdef list plan
+    cdef tuple path
+    cdef Node node
+    cdef Py_ssize_t cursor
+    cdef stdint.uint64_t cursor_navigations
+
+    cdef init_view(self, Message message, list plan, tuple path, Node node):
+        self.message = message
+        self.plan = plan
+        self.path = path
+        self.node = node
+        self.cursor = -1
+
+    cdef bint _follows(self, Py_ssize_t index):
+        # True if the message is positioned at, or before, the index
+        return (self.cursor >= 0) and (index >= self.cursor) and \
+                (self.message.position.navigations == self.cursor_navigations)
+
+    cdef _moved(self, Py_ssize_t index):
+        # the message is now positioned before the element at index
+        self.cursor = index
+        self.cursor_navigations = self.message.position.navigations
+
+    def materialize(self):
+        """Decode the whole container, as it would be without a view."""
+        _navigate(self.message, self.plan, self.path)
+        return self.message._read_node(self.node)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.node.signature.decode()}>"
+
+cdef class MessageDict(MessageView):
+    """Read-only mapping of a dictionary in a received message, entries
+    are decoded as they're accessed."""
+    cdef dict index
+    cdef dict cache
+
+    cdef _index(self):
+        cdef Node element = self.node.children[0]
+        cdef Node key = element.children[0]
+        cdef Node item = element.children[1]
+        cdef dict index = {}
+        cdef Py_ssize_t i = 0
+
+        if self.index is not None:
+            return
+
+        # only the keys are decoded, the values are skipped
+        _navigate(self.message, self.plan, self.path)
+        _enter(self.message, sdbus_h.SD_BUS_TYPE_ARRAY, self.node.contents)
+        while not sdbus_h.sd_bus_message_at_end(self.message.message, 0):
+            _enter(self.message, sdbus_h.SD_BUS_TYPE_DICT_ENTRY,
+                    element.contents)
+            index[self.message._read_node(key)] = i
+            _skip(self.message, item.signature)
+            _exit(self.message)
+            i += 1
+
+        self.index = index
+        self.cache = {}
+
+    def __getitem__(self, key):
+        cdef Node element = self.node.children[0]
+        cdef tuple path
+        cdef object value
+        cdef Py_ssize_t i
+
+        self._index()
+
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+
+        i = self.index[key]
+        path = self.path + (_step(STEP_ENTRY, i, self.node),)
+        if self._follows(i):
+            for _ in range(i - self.cursor):
+                _skip(self.message, element.signature)
+            _enter(self.message, sdbus_h.SD_BUS_TYPE_DICT_ENTRY,
+                    element.contents)
+            _skip(self.message, (<Node>element.children[0]).signature)
+        else:
+            _navigate(self.message, self.plan, path)
+        value = _lazy_value(self.message, self.plan, path,
+                element.children[1])
+        _exit(self.message)
+        self._moved(i + 1)
+
+        self.cache[key] = value
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        self._index()
+        return key in self.index
+
+    def __len__(self):
+        self._index()
+        return len(self.index)
+
+    def __iter__(self):
+        self._index()
+        return iter(self.index)
+
+    def keys(self):
+        self._index()
+        return self.index.keys()
+
+    def items(self):
+        cdef Node element = self.node.children[0]
+        cdef Node key = element.children[0]
+        cdef Node item = element.children[1]
+        cdef list items = []
+        cdef Py_ssize_t i = 0
+        cdef object k
+
+        self._index()
+
+        # a single pass, instead of navigating to every value
+        _navigate(self.message, self.plan, self.path)
+        _enter(self.message, sdbus_h.SD_BUS_TYPE_ARRAY, self.node.contents)
+        while not sdbus_h.sd_bus_message_at_end(self.message.message, 0):
+            _enter(self.message, sdbus_h.SD_BUS_TYPE_DICT_ENTRY,
+                    element.contents)
+            k = self.message._read_node(key)
+            if k not in self.cache:
+                self.cache[k] = _lazy_value(self.message, self.plan,
+                        self.path + (_step(STEP_ENTRY, i, self.node),), item)
+            else:
+                _skip(self.message, item.signature)
+            _exit(self.message)
+            items.append((k, self.cache[k]))
+            i += 1
+
+        return items
+
+    def values(self):
+        return [v for _, v in self.items()]
+
+cdef class MessageList(MessageView):
+    """Read-only sequence of an array in a received message, elements
+    are decoded as they're accessed."""
+    cdef object length
+    cdef dict cache
+
+    def __cinit__(self):
+        self.cache = {}
+
+    def __len__(self):
+        cdef Node element = self.node.children[0]
+        cdef Py_ssize_t length = 0
+
+        if self.length is None:
+            _navigate(self.message, self.plan, self.path)
+            _enter(self.message, sdbus_h.SD_BUS_TYPE_ARRAY, self.node.contents)
+            while not sdbus_h.sd_bus_message_at_end(self.message.message, 0):
+                _skip(self.message, element.signature)
+                length += 1
+            self.length = length
+
+        return self.length
+
+    def __getitem__(self, index):
+        cdef Node element = self.node.children[0]
+        cdef tuple path
+        cdef object value
+
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if (index < 0) or (index >= len(self)):
+            raise IndexError("MessageList index out of range")
+
+        try:
+            return self.cache[index]
+        except KeyError:
+            pass
+
+        path = self.path + (_step(STEP_ELEMENT, index, self.node),)
+        if self._follows(index):
+            for _ in range(index - self.cursor):
+                _skip(self.message, element.signature)
+        else:
+            _navigate(self.message, self.plan, path)
+        value = _lazy_value(self.message, self.plan, path, element)
+        self._moved(index + 1)
+
+        self.cache[index] = value
+        return value
+
+    def __iter__(self):
+        cdef Node element = self.node.children[0]
+        cdef list values = []
+        cdef Py_ssize_t i = 0
+
+        # a single pass, instead of navigating to every element
+        _navigate(self.message, self.plan, self.path)
+        _enter(self.message, sdbus_h.SD_BUS_TYPE_ARRAY, self.node.contents)
+        while not sdbus_h.sd_bus_message_at_end(self.message.message, 0):
+            if i not in self.cache:
+                self.cache[i] = _lazy_value(self.message, self.plan,
+                        self.path + (_step(STEP_ELEMENT, i, self.node),),
+                        element)
+            else:
+                _skip(self.message, element.signature)
+            values.append(self.cache[i])
+            i += 1
+
+        self.length = i
+        return iter(values)
+
+Mapping.register(MessageDict)
+Sequence.register(MessageList)
@@ -1,50 +1,214 @@
 # == Copyright: 2017, CCX Technologies
 #cython: language_level=3
 
-cdef int listen_message_handler(sdbus_h.sd_bus_message *m,
+cdef int signal_match_handler(sdbus_h.sd_bus_message *m,
         void *userdata, sdbus_h.sd_bus_error *err) noexcept:
-    cdef PyObject *listen_ptr = <PyObject*>userdata
-    cdef Listen listen = <Listen>listen_ptr
-    cdef Message message = Message()
-
-    message.import_sd_bus_message(m)
-    args = message.read(listen.signature)
-    if listen.seperate_arguments:
-        ensure_future(listen.coroutine(*args), loop=listen.loop)
-    else:
-        ensure_future(listen.coroutine(args), loop=listen.loop)
-    return 1
+    cdef PyObject *match_ptr = <PyObject*>userdata
+    cdef SignalMatch match = <SignalMatch>match_ptr
 
+    match.route(m)
+    # not handled, so other matches for the same signal also receive it
+    return 0
+
+cdef object _route_namespace(object route_signals, str path):
+    # True routes on the sender, a path namespace routes on the
+    # sender and the namespace, None uses the listen's own rule
+    if route_signals is True:
+        return True
+    if route_signals:
+        for namespace in route_signals:
+            if (namespace == '/') or (path == namespace) or \
+                    path.startswith(namespace + '/'):
+                return namespace
+    return None
+
+cdef class SignalMatch:
+    """A match rule added to the bus, shared by all listens it routes to,
+    signals are routed locally on their (sender, path, interface, member,
+    arg0), the bus only sends signals from the rule's sender, so it's the
+    same for all of its routes."""
+    cdef bytes rule
+    cdef object sender
+    cdef dict routes
+    cdef stdint.uint64_t n_listens
+    cdef stdint.uint64_t n_arg0
+
+    cdef sdbus_h.sd_bus_slot *_slot
+
+    def __cinit__(self, Service service, bytes rule, sender):
+        self.rule = rule
+        self.sender = sender
+        self.routes = {}
+        self.n_listens = 0
+        self.n_arg0 = 0
+
+        ret = sdbus_h.sd_bus_add_match(service.bus, &self._slot, self.rule,
+            signal_match_handler, <void *>self)
+        if ret < 0:
+            raise SdbusError(f"Failed to add match: {errorcode[-ret]}", -ret)
+
+    def __dealloc__(self):
+        self._slot = sdbus_h.sd_bus_slot_unref(self._slot)
+
+    cdef add(self, Listen listen):
+        if listen.route[0] != self.sender:
+            raise SdbusError(f"Can't route signals from {listen.route[0]} "
+                f"on a match for {self.sender}")
+
+        # weak references, so the listen stops when it's no longer used
+        self.routes.setdefault(listen.route, []).append(ref(listen))
+        self.n_listens += 1
+        if listen.route[4] is not None:
+            self.n_arg0 += 1
+
+    cdef bint remove(self, tuple route):
+        """Remove a listen that's being deallocated, returns True if it
+        was the last one."""
+        cdef list refs = self.routes.get(route)
+
+        if refs is not None:
+            refs[:] = [r for r in refs if r() is not None]
+            if not refs:
+                del self.routes[route]
+
+        self.n_listens -= 1
+        if route[4] is not None:
+            self.n_arg0 -= 1
+
+        return self.n_listens == 0
+
+    cdef route(self, sdbus_h.sd_bus_message *m):
+        cdef const char *path = sdbus_h.sd_bus_message_get_path(m)
+        cdef const char *interface = sdbus_h.sd_bus_message_get_interface(m)
+        cdef const char *member = sdbus_h.sd_bus_message_get_member(m)
+        cdef const char *signature
+        cdef const char *arg0
+        cdef list refs
+        cdef list arg0_refs = None
+
+        if (path == NULL) or (interface == NULL) or (member == NULL):
+            return
+
+        refs = self.routes.get((self.sender, <bytes>path,
+            <bytes>interface, <bytes>member, None))
+
+        if self.n_arg0:
+            signature = sdbus_h.sd_bus_message_get_signature(m, 1)
+            if (signature != NULL) and ((signature[0] == c's') or
+                    (signature[0] == c'o') or (signature[0] == c'g')):
+                if sdbus_h.sd_bus_message_read_basic(m, signature[0],
+                        &arg0) >= 0:
+                    arg0_refs = self.routes.get((self.sender, <bytes>path,
+                        <bytes>interface, <bytes>member, <bytes>arg0))
+                # lazy views are only accessed once the signal has been
+                # dispatched, so this move needn't be counted
+                sdbus_h.sd_bus_message_rewind(m, 1)
+
+        if refs is not None:
+            self.dispatch(m, refs)
+
+        if arg0_refs is not None:
+            self.dispatch(m, arg0_refs)
+
+    cdef dispatch(self, sdbus_h.sd_bus_message *m, list refs):
+        cdef Listen listen
+
+        for r in tuple(refs):
+            listen = r()
+            if listen is None:
+                continue
+
+            # one listen's error mustn't stop the others sharing the rule
+            try:
+                listen.dispatch(m)
+            except Exception as e:
+                listen.loop.call_exception_handler({'message': f"{e} for "
+                    f"signal {listen.route[3].decode()}", 'exception': e})
+
+@cython.no_gc_clear
 cdef class Listen:
-    cdef bytes match
     cdef object coroutine
     cdef bytes signature
     cdef bool seperate_arguments
-
-    cdef sdbus_h.sd_bus_slot *_slot
+    cdef int array_mode
+    cdef bint lazy
+    cdef bint direct
     cdef object loop
 
-    def __cinit__(self, Service service, address, path, interface, member,
-            coroutine, args=(), signature=b'ANY', seperate_arguments=True):
+    cdef Service service
+    cdef SignalMatch match
+    cdef tuple route
+    cdef object __weakref__
 
-        match = []
-        match.append(f"sender='{address}'")
-        match.append("type='signal'")
-        match.append(f"interface='{interface}'")
-        match.append(f"member='{member}'")
-        match.append(f"path='{path}'")
-        match += [f"arg{i}='{a}'" for i,a in enumerate(args)]
+    def __cinit__(self, Service service, address, path, interface, member,
+            coroutine, args=(), signature=b'ANY', seperate_arguments=True,
+            array_type=None, lazy=False, direct=False):
+        cdef bytes rule
 
-        self.match = (','.join(match)).encode()
         self.coroutine = coroutine
         self.signature = signature
         self.loop = service.loop
         self.seperate_arguments = seperate_arguments
+        self.array_mode = _array_mode(array_type)
+        self.lazy = lazy
+        self.direct = direct
+        self.service = service
 
-        ret = sdbus_h.sd_bus_add_match(service.bus, &self._slot, self.match,
-            listen_message_handler, <void *>self)
-        if ret < 0:
-            raise SdbusError(f"Failed to add match: {errorcode[-ret]}", -ret)
+        # the bus only filters on the rule, the rest is routed locally
+        self.route = (address, path.encode(), interface.encode(),
+            member.encode(), f"{args[0]}".encode() if args else None)
+
+        namespace = None
+        if len(args) <= 1:
+            namespace = _route_namespace(service.route_signals, path)
+
+        match = []
+        if address is not None:
+            match.append(f"sender='{address}'")
+        match.append("type='signal'")
+        if namespace is True:
+            if address is None:
+                match.append(f"interface='{interface}'")
+        elif namespace is not None:
+            match.append(f"path_namespace='{namespace}'")
+        else:
+            match.append(f"interface='{interface}'")
+            match.append(f"member='{member}'")
+            match.append(f"path='{path}'")
+            match += [f"arg{i}='{a}'" for i,a in enumerate(args)]
+        rule = (','.join(match)).encode()
+
+        self.match = service.signal_matches.get(rule)
+        if self.match is None:
+            self.match = SignalMatch(service, rule, address)
+            service.signal_matches[rule] = self.match
+        self.match.add(self)
 
     def __dealloc__(self):
-        self._slot = sdbus_h.sd_bus_slot_unref(self._slot)
+        if (self.match is not None) and self.match.remove(self.route):
+            # the rule is removed from the bus with its last listen
+            if self.service.signal_matches.get(self.match.rule) is self.match:
+                del self.service.signal_matches[self.match.rule]
+
+    cdef dispatch(self, sdbus_h.sd_bus_message *m):
+        cdef Message message = Message()
+
+        message.import_sd_bus_message(m)
+
+        # other listens may have already read the message, the position
+        # is shared with them, so their lazy views know it was moved
+        message.position = self.service.read_position(m)
+        sdbus_h.sd_bus_message_rewind(m, 1)
+        message.position.navigations += 1
+        message.array_mode = self.array_mode
+        if self.lazy:
+            args = _read_lazy(message, self.signature)
+        else:
+            args = message.read(self.signature)
+        if self.direct:
+            # ie. queued for a subscription, in the order received
+            self.coroutine(args)
+        elif self.seperate_arguments:
+            ensure_future(self.coroutine(*args), loop=self.loop)
+        else:
+            ensure_future(self.coroutine(args), loop=self.loop)
@@ -13,11 +13,145 @@ cdef union _value:
     bint c_bool
     const char* c_str
 
+# how arrays of fixed-width types (ie. ay, ai, ad) are returned
+cdef enum:
+    ARRAY_LIST = 0
+    ARRAY_BYTES = 1
+    ARRAY_MEMORYVIEW = 2
+    ARRAY_ARRAY = 3
+    ARRAY_NUMPY = 4
+
+cdef int _array_mode(object array_type) except -1:
+    # numpy is optional, if it isn't imported it can't have been requested
+    numpy = sys.modules.get('numpy')
+
+    if (array_type is None) or (array_type is list):
+        return ARRAY_LIST
+    elif array_type is bytes:
+        return ARRAY_BYTES
+    elif array_type is memoryview:
+        return ARRAY_MEMORYVIEW
+    elif array_type is array:
+        return ARRAY_ARRAY
+    elif (numpy is not None) and (array_type is numpy.ndarray):
+        return ARRAY_NUMPY
+    raise TypeError(
+            f"Unsupported array type {array_type}, expecting list, "
+            "bytes, memoryview, array.array, or numpy.ndarray")
+
+cdef str _array_typecode(char s):
+    if s == sdbus_h.SD_BUS_TYPE_BYTE:
+        return 'B'
+    elif s == sdbus_h.SD_BUS_TYPE_INT16:
+        return 'h'
+    elif s == sdbus_h.SD_BUS_TYPE_UINT16:
+        return 'H'
+    elif s == sdbus_h.SD_BUS_TYPE_INT32:
+        return 'i'
+    elif (s == sdbus_h.SD_BUS_TYPE_UINT32) or (s == sdbus_h.SD_BUS_TYPE_BOOLEAN):
+        # D-Bus booleans are 32-bit
+        return 'I'
+    elif s == sdbus_h.SD_BUS_TYPE_INT64:
+        return 'q'
+    elif s == sdbus_h.SD_BUS_TYPE_UINT64:
+        return 'Q'
+    elif s == sdbus_h.SD_BUS_TYPE_DOUBLE:
+        return 'd'
+    raise SdbusError(f"No array type for signature {chr(s)}")
+
+cdef Py_ssize_t _array_itemsize(char s):
+    if s == sdbus_h.SD_BUS_TYPE_BYTE:
+        return 1
+    elif (s == sdbus_h.SD_BUS_TYPE_INT16) or (s == sdbus_h.SD_BUS_TYPE_UINT16):
+        return 2
+    elif (s == sdbus_h.SD_BUS_TYPE_INT64) or (s == sdbus_h.SD_BUS_TYPE_UINT64) \
+            or (s == sdbus_h.SD_BUS_TYPE_DOUBLE):
+        return 8
+    return 4
+
+cdef bytes _array_formats(char s):
+    # buffer formats that can be appended as an array of this type,
+    # the itemsize is checked separately
+    if s == sdbus_h.SD_BUS_TYPE_BYTE:
+        return b"Bbc"
+    elif s == sdbus_h.SD_BUS_TYPE_INT16:
+        return b"h"
+    elif s == sdbus_h.SD_BUS_TYPE_UINT16:
+        return b"H"
+    elif (s == sdbus_h.SD_BUS_TYPE_INT32) or (s == sdbus_h.SD_BUS_TYPE_INT64):
+        return b"ilqn"
+    elif (s == sdbus_h.SD_BUS_TYPE_UINT32) or (s == sdbus_h.SD_BUS_TYPE_UINT64):
+        return b"ILQN"
+    elif s == sdbus_h.SD_BUS_TYPE_DOUBLE:
+        return b"d"
+    return b""
+
+cdef class ArrayView:
+    """Read-only buffer referencing an array in a received message."""
+    cdef sdbus_h.sd_bus_message *message
+    cdef const void *data
+    cdef bytes format
+    cdef Py_ssize_t shape[1]
+    cdef Py_ssize_t strides[1]
+
+    def __cinit__(self):
+        self.message = NULL
+
+    def __dealloc__(self):
+        self.message = sdbus_h.sd_bus_message_unref(self.message)
+
+    cdef import_array(self, sdbus_h.sd_bus_message *message,
+            const void *data, size_t size, char s):
+        # the data is owned by the message so hold a reference to it
+        self.message = sdbus_h.sd_bus_message_unref(self.message)
+        self.message = sdbus_h.sd_bus_message_ref(message)
+        self.data = data
+        self.format = _array_typecode(s).encode()
+        self.strides[0] = _array_itemsize(s)
+        self.shape[0] = size // self.strides[0]
+
+    def __getbuffer__(self, Py_buffer *buffer, int flags):
+        if flags & PyBUF_WRITABLE:
+            raise BufferError("Message arrays are read-only")
+
+        buffer.buf = <void*>self.data
+        buffer.obj = self
+        buffer.len = self.shape[0] * self.strides[0]
+        buffer.readonly = 1
+        buffer.ndim = 1
+        buffer.suboffsets = NULL
+        buffer.internal = NULL
+
+        if flags & PyBUF_FORMAT:
+            buffer.format = self.format
+            buffer.itemsize = self.strides[0]
+            buffer.shape = self.shape if flags & PyBUF_ND else NULL
+            buffer.strides = self.strides if flags & PyBUF_STRIDES else NULL
+        else:
+            # without a format consumers expect unsigned bytes
+            buffer.format = NULL
+            buffer.itemsize = 1
+            buffer.shape = NULL
+            buffer.strides = NULL
+
+    def __releasebuffer__(self, Py_buffer *buffer):
+        pass
+
+cdef class ReadPosition:
+    """Counts the times a received message's read position was moved from
+    the start, shared by all of the Messages wrapping it, since they share
+    the position."""
+    cdef stdint.uint64_t navigations
+
 cdef class Message:
     cdef sdbus_h.sd_bus_message *message
+    cdef int array_mode
+    cdef ReadPosition position
 
     def __cinit__(self):
         self.message = NULL
+        self.array_mode = ARRAY_LIST
+        self.position = ReadPosition()
 
     def __dealloc__(self):
         self.message = sdbus_h.sd_bus_message_unref(self.message)
@@ -76,32 +210,31 @@ cdef class Message:
             raise SdbusError(
                 f"Failed to create new signal: {errorcode[-ret]}", -ret)
 
-    # ------------
-
-    cdef _element_length(self, const char *signature):
-        cdef unsigned int i = 0
-        cdef unsigned int scnt = 0
-        cdef unsigned int dcnt = 0
+    cdef new_snapshot(self, Service service):
+        # only holds encoded values to be copied into other messages
+        cdef int ret
+        self.message = sdbus_h.sd_bus_message_unref(self.message)
+        ret = sdbus_h.sd_bus_message_new_signal(service.bus, &self.message,
+                b"/", b"adbus.Snapshot", b"Value")
+        if ret < 0:
+            raise SdbusError(
+                f"Failed to create new snapshot: {errorcode[-ret]}", -ret)
 
-        while signature[i] != 0:
-            s = signature[i]
-            i += 1
+    cdef seal(self):
+        cdef int ret = sdbus_h.sd_bus_message_seal(self.message, 1, 0)
+        if ret < 0:
+            raise SdbusError(f"Failed to seal message: {errorcode[-ret]}", -ret)
 
-            if s == sdbus_h.SD_BUS_TYPE_ARRAY:
-                continue
-            elif s == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN:
-                scnt += 1
-            elif s == sdbus_h.SD_BUS_TYPE_STRUCT_END:
-                scnt -= 1
-            elif s == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
-                dcnt += 1
-            elif s == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_END:
-                dcnt -= 1
+    cdef copy_to(self, Message message):
+        cdef int ret
 
-            if not dcnt and not scnt:
-                break
+        ret = sdbus_h.sd_bus_message_rewind(self.message, 1)
+        if ret < 0:
+            raise SdbusError(f"Failed to rewind message: {errorcode[-ret]}", -ret)
 
-        return i
+        ret = sdbus_h.sd_bus_message_copy(message.message, self.message, 1)
+        if ret < 0:
+            raise SdbusError(f"Failed to copy message: {errorcode[-ret]}", -ret)
 
     # ------------
 
@@ -113,175 +246,280 @@ cdef class Message:
                     f"Failed to read value with signature {chr(sig)}: {errorcode[-ret]}",
                     -ret)
 
-    cdef _read_array(self, const char *signature, unsigned int *index):
-        cdef unsigned int elength = self._element_length(&signature[index[0]])
-        cdef bytes bsignature = signature
-        cdef bytes psignature = bsignature[index[0]:elength+index[0]] + bytes(1)
-        cdef char *esignature = psignature
-        cdef list values = []
-        cdef list value
+    cdef object _read_fixed_array(self, Node node):
+        cdef char s = (<Node>node.children[0]).type
+        cdef const void *data = NULL
+        cdef size_t size = 0
+        cdef ArrayView view
+        cdef object values
+        cdef int ret
+
+        # reads the whole array at once instead of element by element
+        ret = sdbus_h.sd_bus_message_read_array(self.message, s, &data, &size)
+        if ret == -EOPNOTSUPP:
+            # only supported for messages in native byte order
+            return None
+        elif ret < 0:
+            raise SdbusError(
+                    f"Failed to read array {node.contents}: {errorcode[-ret]}",
+                    -ret)
+
+        if self.array_mode == ARRAY_BYTES:
+            return (<const char*>data)[:size]
+
+        view = ArrayView()
+        view.import_array(self.message, data, size, s)
+
+        if self.array_mode == ARRAY_MEMORYVIEW:
+            return memoryview(view)
+
+        elif self.array_mode == ARRAY_ARRAY:
+            values = array(_array_typecode(s))
+            values.frombytes(view)
+            return values
 
-        index[0] += elength
+        elif self.array_mode == ARRAY_NUMPY:
+            # read-only, references the message directly
+            values = sys.modules['numpy'].frombuffer(view, _array_typecode(s))
+            if s == sdbus_h.SD_BUS_TYPE_BOOLEAN:
+                return values.astype(bool)
+            return values
+
+        values = memoryview(view).tolist()
+        if s == sdbus_h.SD_BUS_TYPE_BOOLEAN:
+            return [bool(v) for v in values]
+        return values
+
+    cdef object _read_struct_array(self, Node node):
+        cdef Node element = node.children[0]
+        cdef Node child
+        cdef bytearray data = bytearray()
+        cdef Py_ssize_t itemsize = 0
+        cdef Py_ssize_t offset
+        cdef Py_ssize_t size
+        cdef Py_ssize_t used = 0
+        cdef _value v
+        cdef list formats = []
+
+        # each struct is packed into a record of a numpy structured array
+        for child in element.children:
+            formats.append(_array_typecode(child.type))
+            itemsize += _array_itemsize(child.type)
 
         if sdbus_h.sd_bus_message_enter_container(self.message,
-                sdbus_h.SD_BUS_TYPE_ARRAY, esignature) < 0:
-            raise SdbusError(f"Failed to enter array {esignature}")
+                sdbus_h.SD_BUS_TYPE_ARRAY, node.contents) < 0:
+            raise SdbusError(f"Failed to enter array {node.contents}")
 
-        while not sdbus_h.sd_bus_message_at_end(self.message,0):
-            value = self.read(esignature)
-            if len(value) == 1:
-                values.append(value[0])
-            else:
-                values.append(value)
+        while not sdbus_h.sd_bus_message_at_end(self.message, 0):
+            if used + itemsize > len(data):
+                data.extend(bytes(max(used, 16*itemsize)))
+
+            if sdbus_h.sd_bus_message_enter_container(self.message,
+                    sdbus_h.SD_BUS_TYPE_STRUCT, element.contents) < 0:
+                raise SdbusError(f"Failed to enter structure {element.contents}")
+
+            offset = used
+            for child in element.children:
+                size = _array_itemsize(child.type)
+                self._read_basic(child.type, <void*>&v)
+                memcpy(<char*>data + offset, <void*>&v, size)
+                offset += size
+
+            if sdbus_h.sd_bus_message_exit_container(self.message) < 0:
+                raise SdbusError(f"Failed to exit structure {element.contents}")
+
+            used += itemsize
 
         if sdbus_h.sd_bus_message_exit_container(self.message) < 0:
-            raise SdbusError(f"Failed to exit array {esignature}")
+            raise SdbusError(f"Failed to exit array {node.contents}")
+
+        del data[used:]
+        return sys.modules['numpy'].frombuffer(data, ','.join(formats))
+
+    cdef object _read_array(self, Node node):
+        cdef Node element = node.children[0]
+        cdef Node key
+        cdef Node item
+        cdef object values
+        cdef object k
+
+        if element.fixed:
+            values = self._read_fixed_array(node)
+            if values is not None:
+                return values
+
+        elif element.fixed_struct and (self.array_mode == ARRAY_NUMPY):
+            return self._read_struct_array(node)
+
+        if sdbus_h.sd_bus_message_enter_container(self.message,
+                sdbus_h.SD_BUS_TYPE_ARRAY, node.contents) < 0:
+            raise SdbusError(f"Failed to enter array {node.contents}")
+
+        # A dictionary is always an array of entries with two elements
+        # (based on D-Bus definition) so if we're a dictionary convert it.
+        if element.type == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
+            key, item = element.children
+            values = {}
+            while not sdbus_h.sd_bus_message_at_end(self.message, 0):
+                if sdbus_h.sd_bus_message_enter_container(self.message,
+                        sdbus_h.SD_BUS_TYPE_DICT_ENTRY, element.contents) < 0:
+                    raise SdbusError(
+                            f"Failed to enter dictionary {element.contents}")
+
+                # the key has to be read before the value
+                k = self._read_node(key)
+                values[k] = self._read_node(item)
+
+                if sdbus_h.sd_bus_message_exit_container(self.message) < 0:
+                    raise SdbusError(
+                            f"Failed to exit dictionary {element.contents}")
 
-        # A dictionary is always an array with two elements (based on D-Bus
-        # definition) so if we're a dictionary convert it.
-        if esignature[0] == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
-            return {v[0]: v[1] for v in values}
         else:
-            return values
+            values = []
+            while not sdbus_h.sd_bus_message_at_end(self.message, 0):
+                values.append(self._read_node(element))
+
+        if sdbus_h.sd_bus_message_exit_container(self.message) < 0:
+            raise SdbusError(f"Failed to exit array {node.contents}")
+
+        if element.fixed and (self.array_mode == ARRAY_NUMPY):
+            return sys.modules['numpy'].array(values,
+                    bool if element.type == sdbus_h.SD_BUS_TYPE_BOOLEAN
+                    else _array_typecode(element.type))
+
+        return values
 
     cdef _read_variant(self):
         cdef const char *esignature
-        cdef list value
+        cdef object value
 
         if sdbus_h.sd_bus_message_enter_container(self.message,
                 sdbus_h.SD_BUS_TYPE_VARIANT, NULL) < 0:
             raise SdbusError("Failed to enter variant")
 
         esignature = sdbus_h.sd_bus_message_get_signature(self.message, 0)
-        value = self.read(esignature)
+
+        # variant only has one type
+        value = self._read_node(_signature_plan(esignature)[0])
 
         if sdbus_h.sd_bus_message_exit_container(self.message) < 0:
             raise SdbusError(f"Failed to exit variant {esignature}")
 
-        # variant only has one type
-        return value[0]
-
-    cdef tuple _read_struct(self, const char *signature, unsigned int *index):
-        cdef unsigned int elength = self._element_length(&signature[index[0]-1])-1
-        cdef bytes bsignature = signature
-        cdef bytes psignature = bsignature[index[0]:elength+index[0]-1] + bytes(1)
-        cdef char *esignature = psignature
-        cdef list value
+        return value
 
-        index[0] += elength + 1
+    cdef tuple _read_struct(self, Node node):
+        cdef list value = []
+        cdef Node child
 
         if sdbus_h.sd_bus_message_enter_container(self.message,
-                sdbus_h.SD_BUS_TYPE_STRUCT, esignature) < 0:
-            raise SdbusError(f"Failed to enter structure {esignature}")
+                sdbus_h.SD_BUS_TYPE_STRUCT, node.contents) < 0:
+            raise SdbusError(f"Failed to enter structure {node.contents}")
 
-        value = self.read(esignature)
+        for child in node.children:
+            value.append(self._read_node(child))
 
         if sdbus_h.sd_bus_message_exit_container(self.message) < 0:
-            raise SdbusError(f"Failed to exit structure {esignature}")
+            raise SdbusError(f"Failed to exit structure {node.contents}")
 
         return tuple(value)
 
-    cdef list _read_dict(self, const char *signature, unsigned int *index):
-        cdef unsigned int elength = self._element_length(&signature[index[0]-1])-1
-        cdef bytes bsignature = signature
-        cdef bytes psignature = bsignature[index[0]:elength+index[0]-1] + bytes(1)
-        cdef char *esignature = psignature
-
-        index[0] += elength + 1
+    cdef list _read_dict(self, Node node):
+        cdef list value = []
+        cdef Node child
 
         if sdbus_h.sd_bus_message_enter_container(self.message,
-                sdbus_h.SD_BUS_TYPE_DICT_ENTRY, esignature) < 0:
-            raise SdbusError(f"Failed to enter dictionary {esignature}")
+                sdbus_h.SD_BUS_TYPE_DICT_ENTRY, node.contents) < 0:
+            raise SdbusError(f"Failed to enter dictionary {node.contents}")
 
-        value = self.read(esignature)
+        for child in node.children:
+            value.append(self._read_node(child))
 
         if sdbus_h.sd_bus_message_exit_container(self.message) < 0:
-            raise SdbusError(f"Failed to exit dictionary {esignature}")
+            raise SdbusError(f"Failed to exit dictionary {node.contents}")
 
         return value
 
-    cdef list read(self, const char *signature=b"ANY"):
+    cdef object _read_node(self, Node node):
         cdef _value v
-        cdef list values = []
-        cdef unsigned int i = 0
-        cdef char s
+        cdef char s = node.type
 
-        if signature[0] == b'A':
-            signature = sdbus_h.sd_bus_message_get_signature(self.message, 0)
+        if s == sdbus_h.SD_BUS_TYPE_ARRAY:
+            return self._read_array(node)
 
-        while i < len(signature):
-            s = signature[i]
-            i += 1
+        elif s == sdbus_h.SD_BUS_TYPE_VARIANT:
+            return self._read_variant()
 
-            if s ==  sdbus_h._SD_BUS_TYPE_INVALID:
-                break
+        elif s == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN:
+            return self._read_struct(node)
 
-            elif s == sdbus_h.SD_BUS_TYPE_ARRAY:
-                values.append(self._read_array(signature, &i))
+        elif s == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
+            return self._read_dict(node)
 
-            elif s == sdbus_h.SD_BUS_TYPE_VARIANT:
-                values.append(self._read_variant())
+        elif s == sdbus_h.SD_BUS_TYPE_BYTE:
+            self._read_basic(s, <void*>&v.c_byte)
+            return v.c_byte
 
-            elif s == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN:
-                values.append(self._read_struct(signature, &i))
+        elif s == sdbus_h.SD_BUS_TYPE_BOOLEAN:
+            self._read_basic(s, <void*>&v.c_bool)
+            return v.c_bool
 
-            elif s == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
-                values.append(self._read_dict(signature, &i))
+        elif s == sdbus_h.SD_BUS_TYPE_UINT16:
+            self._read_basic(s, <void*>&v.c_uint16)
+            return v.c_uint16
 
-            elif s == sdbus_h.SD_BUS_TYPE_BYTE:
-                self._read_basic(s, <void*>&v.c_byte)
-                values.append(v.c_byte)
+        elif s == sdbus_h.SD_BUS_TYPE_INT16:
+            self._read_basic(s, <void*>&v.c_int16)
+            return v.c_int16
 
-            elif s == sdbus_h.SD_BUS_TYPE_BOOLEAN:
-                self._read_basic(s, <void*>&v.c_bool)
-                values.append(v.c_bool)
+        elif s == sdbus_h.SD_BUS_TYPE_UINT32:
+            self._read_basic(s, <void*>&v.c_uint32)
+            return v.c_uint32
 
-            elif s == sdbus_h.SD_BUS_TYPE_UINT16:
-                self._read_basic(s, <void*>&v.c_uint16)
-                values.append(v.c_uint16)
+        elif s == sdbus_h.SD_BUS_TYPE_INT32:
+            self._read_basic(s, <void*>&v.c_int32)
+            return v.c_int32
 
-            elif s == sdbus_h.SD_BUS_TYPE_INT16:
-                self._read_basic(s, <void*>&v.c_int16)
-                values.append(v.c_int16)
+        elif s == sdbus_h.SD_BUS_TYPE_UINT64:
+            self._read_basic(s, <void*>&v.c_uint64)
+            return v.c_uint64
 
-            elif s == sdbus_h.SD_BUS_TYPE_UINT32:
-                self._read_basic(s, <void*>&v.c_uint32)
-                values.append(v.c_uint32)
+        elif s == sdbus_h.SD_BUS_TYPE_INT64:
+            self._read_basic(s, <void*>&v.c_int64)
+            return v.c_int64
 
-            elif s == sdbus_h.SD_BUS_TYPE_INT32:
-                self._read_basic(s, <void*>&v.c_int32)
-                values.append(v.c_int32)
+        elif s == sdbus_h.SD_BUS_TYPE_DOUBLE:
+            self._read_basic(s, <void*>&v.c_double)
+            return v.c_double
 
-            elif s == sdbus_h.SD_BUS_TYPE_UINT64:
-                self._read_basic(s, <void*>&v.c_uint64)
-                values.append(v.c_uint64)
+        elif s == sdbus_h.SD_BUS_TYPE_STRING:
+            self._read_basic(s, <void*>&v.c_str)
+            return v.c_str.decode('utf-8')
 
-            elif s == sdbus_h.SD_BUS_TYPE_INT64:
-                self._read_basic(s, <void*>&v.c_int64)
-                values.append(v.c_int64)
+        elif s == sdbus_h.SD_BUS_TYPE_OBJECT_PATH:
+            self._read_basic(s, <void*>&v.c_str)
+            return v.c_str.decode('utf-8')
 
-            elif s == sdbus_h.SD_BUS_TYPE_DOUBLE:
-                self._read_basic(s, <void*>&v.c_double)
-                values.append(v.c_double)
+        elif s == sdbus_h.SD_BUS_TYPE_SIGNATURE:
+            self._read_basic(s, <void*>&v.c_str)
+            return v.c_str.decode('utf-8')
 
-            elif s == sdbus_h.SD_BUS_TYPE_STRING:
-                self._read_basic(s, <void*>&v.c_str)
-                values.append(v.c_str.decode('utf-8'))
+        elif s == sdbus_h.SD_BUS_TYPE_UNIX_FD:
+            # the message owns the descriptor, so a duplicate is returned
+            self._read_basic(s, <void*>&v.c_int32)
+            return UnixFd(v.c_int32)
 
-            elif s == sdbus_h.SD_BUS_TYPE_OBJECT_PATH:
-                self._read_basic(s, <void*>&v.c_str)
-                values.append(v.c_str.decode('utf-8'))
+        else:
+            raise SdbusError(f"Unsupported signature type {chr(s)} for read")
 
-            elif s == sdbus_h.SD_BUS_TYPE_SIGNATURE:
-                self._read_basic(s, <void*>&v.c_str)
-                values.append(v.c_str.decode('utf-8'))
+    cdef list read(self, const char *signature=b"ANY"):
+        cdef list values = []
+        cdef Node node
 
-            elif s == sdbus_h.SD_BUS_TYPE_UNIX_FD:
-                self._read_basic(s, <void*>&v.c_int32)
-                values.append(v.c_int32)
+        if signature[0] == b'A':
+            signature = sdbus_h.sd_bus_message_get_signature(self.message, 0)
 
-            else:
-                raise SdbusError(f"Unsupported signature type {signature} -> {chr(s)} for read")
+        for node in _signature_plan(signature):
+            values.append(self._read_node(node))
 
         return values
 
@@ -294,167 +532,163 @@ cdef class Message:
             raise SdbusError(
                     f"Failed to append value {chr(sig)}: {errorcode[-ret]}", -ret)
 
-    cdef _append_array(self, const char *signature, object value,
-            unsigned int *index):
-        cdef unsigned int elength = self._element_length(&signature[index[0]])
-        cdef bytes bsignature = signature
-        cdef bytes psignature = bsignature[index[0]:elength+index[0]] + bytes(1)
-        cdef char *esignature = psignature
+    cdef bint _append_buffer(self, Node node, object value) except -1:
+        cdef char s = (<Node>node.children[0]).type
+        cdef Py_buffer buffer
+        cdef bytes format
+        cdef int ret
 
-        index[0] += elength
+        if not PyObject_CheckBuffer(value):
+            return False
+
+        try:
+            PyObject_GetBuffer(value, &buffer,
+                    PyBUF_C_CONTIGUOUS | PyBUF_FORMAT)
+        except (BufferError, ValueError):
+            # not contiguous
+            return False
+
+        try:
+            format = buffer.format if buffer.format != NULL else b'B'
+            format = format.lstrip(b'@=')
+
+            # anything that doesn't match exactly is appended per element
+            if (len(format) != 1) or (buffer.itemsize != _array_itemsize(s)) \
+                    or (format[0] not in _array_formats(s)):
+                return False
+
+            ret = sdbus_h.sd_bus_message_append_array(self.message, s,
+                    buffer.buf, buffer.len)
+            if ret < 0:
+                raise SdbusError(
+                        f"Failed to append array {node.contents}: {errorcode[-ret]}",
+                        -ret)
+
+            return True
+
+        finally:
+            PyBuffer_Release(&buffer)
+
+    cdef _append_array(self, Node node, object value):
+        cdef Node element = node.children[0]
+
+        # buffers (bytes, array.array, numpy, etc.) are copied in one go
+        if element.fixed and self._append_buffer(node, value):
+            return
 
         if sdbus_h.sd_bus_message_open_container(self.message,
-                sdbus_h.SD_BUS_TYPE_ARRAY, esignature) < 0:
-            raise SdbusError(f"Failed to open array {esignature}")
+                sdbus_h.SD_BUS_TYPE_ARRAY, node.contents) < 0:
+            raise SdbusError(f"Failed to open array {node.contents}")
 
         for item in value:
-            self.append(esignature, item)
+            self._append_node(element, item)
 
         if sdbus_h.sd_bus_message_close_container(self.message) < 0:
-            raise SdbusError(f"Failed to close array {esignature}")
+            raise SdbusError(f"Failed to close array {node.contents}")
 
     cdef _append_variant(self, object value, value_signature):
         cdef bytes signature
-        cdef const char *esignature
+        cdef list plan
 
         if value_signature is not None:
             signature = value_signature
         else:
             signature = _object_signature(value)
 
-        esignature = signature
+        plan = _signature_plan(signature)
 
         if sdbus_h.sd_bus_message_open_container(self.message,
-                sdbus_h.SD_BUS_TYPE_VARIANT, esignature) < 0:
-            raise SdbusError(f"Failed to open variant {esignature}")
+                sdbus_h.SD_BUS_TYPE_VARIANT, signature) < 0:
+            raise SdbusError(f"Failed to open variant {signature}")
 
-        self.append(esignature, value)
+        if plan:
+            self._append_node(plan[0], value)
 
         if sdbus_h.sd_bus_message_close_container(self.message) < 0:
-            raise SdbusError(f"Failed to close variant {esignature}")
+            raise SdbusError(f"Failed to close variant {signature}")
 
-    cdef _append_struct(self, const char *signature, object value,
-            unsigned int *index):
-        cdef unsigned int elength = self._element_length(&signature[index[0]-1])-2
-        cdef bytes bsignature = signature
-        cdef bytes psignature = bsignature[index[0]:elength+index[0]] + bytes(1)
-        cdef char *esignature = psignature
+    cdef _append_struct(self, Node node, object value):
+        cdef Node child
 
-        index[0] += elength + 2
+        if isinstance(value, (str, bytes)):
+            value = [value]
 
         if sdbus_h.sd_bus_message_open_container(self.message,
-                sdbus_h.SD_BUS_TYPE_STRUCT, esignature) < 0:
-            raise SdbusError(f"Failed to open struct {psignature} {index[0]} {elength} {signature}")
+                sdbus_h.SD_BUS_TYPE_STRUCT, node.contents) < 0:
+            raise SdbusError(f"Failed to open struct {node.contents}")
 
-        self._append_multiple(esignature, value)
+        for child, item in zip(node.children, value):
+            self._append_node(child, item)
 
         if sdbus_h.sd_bus_message_close_container(self.message) < 0:
-            raise SdbusError(f"Failed to close struct {esignature}")
+            raise SdbusError(f"Failed to close struct {node.contents}")
 
-    cdef _append_dict(self, const char *signature, object value,
-            unsigned int *index):
-        cdef unsigned int elength = self._element_length(&signature[index[0]])
-        cdef bytes bsignature = signature
-        cdef bytes psignature = bsignature[index[0]:elength+index[0]] + bytes(1)
-        cdef char *esignature = psignature
+    cdef _append_dict(self, Node node, object value):
+        cdef Node element = node.children[0]
+        cdef Node key
+        cdef Node item
 
-        index[0] += elength
+        key, item = element.children
 
         if sdbus_h.sd_bus_message_open_container(self.message,
-                sdbus_h.SD_BUS_TYPE_ARRAY, esignature) < 0:
-            raise SdbusError(f"Failed to open dict {esignature}")
+                sdbus_h.SD_BUS_TYPE_ARRAY, node.contents) < 0:
+            raise SdbusError(f"Failed to open dict {node.contents}")
 
-        for item in value.items():
-            self._append_dict_item(esignature, item)
+        for k, v in value.items():
+            if sdbus_h.sd_bus_message_open_container(self.message,
+                    sdbus_h.SD_BUS_TYPE_DICT_ENTRY, element.contents) < 0:
+                raise SdbusError(f"Failed to open dict item {element.contents}")
 
-        if sdbus_h.sd_bus_message_close_container(self.message) < 0:
-            raise SdbusError(f"Failed to close dict {esignature}")
-
-    cdef _append_dict_item(self, const char *signature, object value):
-        cdef unsigned int elength = self._element_length(&signature[2])
-        cdef bytes bsignature = signature
-        cdef bytes psignature = bsignature[1:2+elength] + bytes(1)
-        cdef char *esignature = psignature
-        cdef char ksignature = esignature[0]
-        cdef char *vsignature = &esignature[1]
+            self._append_node(key, k)
+            self._append_node(item, v)
 
-        if sdbus_h.sd_bus_message_open_container(self.message,
-                sdbus_h.SD_BUS_TYPE_DICT_ENTRY, esignature) < 0:
-            raise SdbusError(f"Failed to open dict item {esignature}")
-
-        self.append(&ksignature, value[0])
-        self.append(vsignature, value[1])
+            if sdbus_h.sd_bus_message_close_container(self.message) < 0:
+                raise SdbusError(f"Failed to close dict item {element.contents}")
 
         if sdbus_h.sd_bus_message_close_container(self.message) < 0:
-            raise SdbusError(f"Failed to close dict item {esignature}")
+            raise SdbusError(f"Failed to close dict {node.contents}")
 
-    cdef _append_multiple(self, const char *signature, object values):
-        cdef unsigned int i = 0
-        cdef char s
-        cdef object value
-
-        if isinstance(values, (str, bytes)):
-            values = [values]
-        elif isinstance(values, tuple):
-            values = list(values)
-
-        while values:
-            s = signature[i]
-            i += 1
-
-            value = values.pop(0)
+    cdef _append_string(self, char s, object value):
+        cdef bytes v_str
+        cdef str v_bytes
 
+        if type(value) == str:
+            v_str = value.encode('utf-8')
+        else:
             try:
-                value = value.dbus_value
-            except AttributeError:
-                pass
-
-            if s == sdbus_h.SD_BUS_TYPE_ARRAY:
-                if signature[1] == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
-                    self._append_dict(signature, value, &i)
-                else:
-                    self._append_array(signature, value, &i)
-
-            elif s == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN:
-                self._append_struct(signature, value, &i)
+                # dbus only accepts valid utf-8
+                v_bytes = value.decode('utf-8')
+                v_str = v_bytes.encode('utf-8')
+            except (TypeError, AttributeError):
+                # ie. no decode, a TypeError so the value can be cast
+                raise TypeError(f"expected str or bytes, "
+                    f"{type(value).__name__} found") from None
 
-            else:
-                self.append(&s, value)
+        self._append_basic(s, <const char*>v_str)
 
-    cdef append(self, const char *signature, object value):
+    cdef _append_node(self, Node node, object value):
         cdef _value v
-        cdef unsigned int i = 1
-        cdef char s
+        cdef char s = node.type
         cdef bytes value_signature = None
-        cdef bytes v_str
-        cdef str v_bytes
+        cdef object dbus_value_signature
 
-        s = signature[0]
+        dbus_value_signature = getattr(value, 'dbus_value_signature', None)
+        if dbus_value_signature is not None:
+            value_signature = dbus_value_signature.encode()
 
-        try:
-            value_signature = value.dbus_value_signature.encode()
-        except AttributeError:
-            pass
-
-        try:
-            value = value.dbus_value
-        except AttributeError:
-            pass
-
-        if s == sdbus_h._SD_BUS_TYPE_INVALID:
-            return
+        value = getattr(value, 'dbus_value', value)
 
-        elif s == sdbus_h.SD_BUS_TYPE_ARRAY:
-            if signature[1] == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
-                self._append_dict(signature, value, &i)
+        if s == sdbus_h.SD_BUS_TYPE_ARRAY:
+            if (<Node>node.children[0]).type == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN:
+                self._append_dict(node, value)
             else:
-                self._append_array(signature, value, &i)
+                self._append_array(node, value)
 
         elif s == sdbus_h.SD_BUS_TYPE_VARIANT:
             self._append_variant(value, value_signature)
 
         elif s == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN:
-            self._append_struct(signature, value, &i)
+            self._append_struct(node, value)
 
         elif s == sdbus_h.SD_BUS_TYPE_BYTE:
             v.c_byte = value
@@ -492,58 +726,25 @@ cdef class Message:
             v.c_double = value
             self._append_basic(s, <void*>&v.c_double)
 
-        elif s == sdbus_h.SD_BUS_TYPE_STRING:
-            if type(value) == str:
-                v_str = value.encode('utf-8')
-                v.c_str = v_str
-            else:
-                try:
-                    # dbus only accepts valid utf-8
-                    v_bytes = value.decode('utf-8')
-                    v_str = v_bytes.encode('utf-8')
-                    v.c_str = v_str
-                except TypeError as e:
-                    e.args = (f"expected str or bytes, {type(value).__name__} found",)
-                    raise
-            self._append_basic(s, <void*>v.c_str)
-
-        elif s == sdbus_h.SD_BUS_TYPE_OBJECT_PATH:
-            if type(value) == str:
-                v_str = value.encode('utf-8')
-                v.c_str = v_str
-            else:
-                try:
-                    # dbus only accepts valid utf-8
-                    v_bytes = value.decode('utf-8')
-                    v_str = v_bytes.encode('utf-8')
-                    v.c_str = v_str
-                except TypeError as e:
-                    e.args = (f"expected str or bytes, {type(value).__name__} found",)
-                    raise
-            self._append_basic(s, <void*>v.c_str)
-
-        elif s == sdbus_h.SD_BUS_TYPE_SIGNATURE:
-            if type(value) == str:
-                v_str = value.encode('utf-8')
-                v.c_str = v_str
-            else:
-                try:
-                    # dbus only accepts valid utf-8
-                    v_bytes = value.decode('utf-8')
-                    v_str = v_bytes.encode('utf-8')
-                    v.c_str = v_str
-                except TypeError as e:
-                    e.args = (f"expected str or bytes, {type(value).__name__} found",)
-                    raise
-            self._append_basic(s, <void*>v.c_str)
+        elif (s == sdbus_h.SD_BUS_TYPE_STRING) or \
+                (s == sdbus_h.SD_BUS_TYPE_OBJECT_PATH) or \
+                (s == sdbus_h.SD_BUS_TYPE_SIGNATURE):
+            self._append_string(s, value)
 
         elif s == sdbus_h.SD_BUS_TYPE_UNIX_FD:
-            v.c_int32 = value
+            # sd-bus duplicates the descriptor, the caller keeps ownership
+            v.c_int32 = value if isinstance(value, int) else value.fileno()
             self._append_basic(s, <void*>&v.c_int32)
 
         else:
             raise SdbusError(f"Unsupported signature type {chr(s)} for append")
 
+    cdef append(self, const char *signature, object value):
+        cdef list plan = _signature_plan(signature)
+
+        # only appends the first complete type in the signature
+        if plan:
+            self._append_node(plan[0], value)
 
     # ------------
 
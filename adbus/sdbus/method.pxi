@@ -1,34 +1,240 @@
 # == Copyright: 2017, CCX Technologies
 #cython: language_level=3
 
-cdef void _method_message_handler(Method method, Message message):
-    cdef Error error
-    cdef list args
-    cdef object value
+cdef _method_error(Method method, Message message, object exception):
+    cdef Error error = Error()
+
+    method.loop.call_exception_handler({'message': str(exception),
+            'exception': exception})
+    try:
+        error.reply_from_exception(message, exception)
+    except SdbusError as e:
+        method.loop.call_exception_handler({'message': str(e), 'exception': e})
 
-    args = message.read(method.arg_signature)
+cdef _method_reply(Method method, Message message, object value):
+    # built apart from the call, so if the value can't be encoded the
+    # call can still be replied to with the error
+    cdef Message reply = Message()
 
     try:
-        if method.instance:
-            value = method.callback(<object>(method.instance), *args)
-        else:
-            value = method.callback(*args)
+        reply.import_sd_bus_message(message.message)
+        reply.new_method_return()
+        reply.append(method.return_signature, value)
     except Exception as e:
+        _method_error(method, message, e)
+        return
+
+    try:
+        reply.send()
+    except SdbusError as e:
         method.loop.call_exception_handler({'message': str(e), 'exception': e})
-        error = Error()
+
+cdef object _method_call(Method method, list args):
+    if method.instance:
+        return method.callback(<object>(method.instance), *args)
+    return method.callback(*args)
+
+cdef void _method_message_handler(Method method, Message message,
+        list args):
+    cdef object value
+
+    try:
+        value = _method_call(method, args)
+    except Exception as e:
+        _method_error(method, message, e)
+    else:
+        _method_reply(method, message, value)
+    finally:
+        method.service.sent()
+
+cdef void _method_executor_handler(Method method, object token, list args):
+    # runs in the executor, sd-bus isn't thread-safe so the message is
+    # kept on the loop's thread and the result is queued for it to reply
+    cdef Service service = method.service
+
+    try:
+        value = _method_call(method, args)
+    except Exception as e:
+        service.completions.append((token, None, e))
+    else:
+        service.completions.append((token, value, None))
+
+    _method_completed(service)
+
+def _method_process_done(Service service, object token, object future):
+    # called by the process pool's management thread
+    try:
+        service.completions.append((token, future.result(), None))
+    except (Exception, CancelledError) as e:
+        service.completions.append((token, None, e))
+
+    _method_completed(service)
+
+cdef _method_completed(Service service):
+    if not service.completions_pending:
+        service.completions_pending = True
+        service.loop.call_soon_threadsafe(_method_completions, service)
+
+def _method_completions(Service service):
+    """Reply to all of the method calls completed by the executor."""
+    cdef object completions = service.completions
+    cdef dict pending = service.pending_methods
+    cdef Method method
+    cdef Message message
+
+    # cleared before the queue is emptied, so a result queued while
+    # replying either gets replied to here or schedules another call
+    service.completions_pending = False
+
+    while completions:
+        token, value, exception = completions.popleft()
+        method, message = pending.pop(token)
+
+        if not service.process_loop:
+            continue
+
+        try:
+            if exception is None:
+                _method_reply(method, message, value)
+            else:
+                _method_error(method, message, exception)
+        except Exception as e:
+            service.loop.call_exception_handler({'message': str(e),
+                    'exception': e})
+
+        _method_done(method)
+
+    if service.process_loop:
+        service.update_events()
+
+cdef _method_executor(Method method, Message message, list args):
+    cdef Service service = method.service
+    cdef stdint.uint64_t token = service.method_token
+
+    service.method_token += 1
+    service.pending_methods[token] = (method, message)
+
+    if method.process:
+        # only the arguments are sent to the worker, the message stays here
         try:
-            error.reply_from_exception(message, e)
-        except SdbusError as e:
-            method.loop.call_exception_handler({'message': str(e), 'exception': e})
+            future = method.executor.submit(method.callback, *args)
+        except Exception as e:
+            service.completions.append((token, None, e))
+            _method_completed(service)
+        else:
+            future.add_done_callback(partial(_method_process_done, service,
+                    token))
+        return
+
+    try:
+        method.loop.run_in_executor(method.executor, _method_executor_handler,
+                method, token, args)
+    except Exception as e:
+        # ie. the executor was shutdown
+        service.completions.append((token, None, e))
+        _method_completed(service)
+
+async def _method_coroutine(Method method, Message message, object coroutine):
+    try:
+        value = await coroutine
+    except (Exception, CancelledError) as e:
+        _method_error(method, message, e)
+    else:
+        _method_reply(method, message, value)
+    finally:
+        method.service.sent()
+        _method_done(method)
+
+cdef _method_task(Method method, Message message, list args):
+    try:
+        coroutine = _method_call(method, args)
+    except Exception as e:
+        _method_error(method, message, e)
+        method.service.sent()
+        _method_done(method)
+        return
+
+    task = method.loop.create_task(_method_coroutine(method, message, coroutine))
+
+    # the loop only keeps a weak reference to running tasks
+    method.tasks.add(task)
+    task.add_done_callback(method.tasks.discard)
+
+cdef _method_start(Method method, Message message, list args):
+    cdef MethodLane lane = method.lane
+
+    if method.coroutine:
+        _method_task(method, message, args)
         return
 
-    message.new_method_return()
-    message.append(method.return_signature, value)
+    if lane is not None:
+        if lane.busy:
+            # waits on the loop instead of blocking an executor thread
+            lane.waiting.append((method, message, args))
+            return
+        lane.busy = True
+
+    _method_executor(method, message, args)
 
+cdef _method_reject(Method method, Message message):
+    cdef Error error = Error()
+
+    method.service.n_methods_rejected += 1
     try:
-        message.send()
+        error.reply(message, b"org.freedesktop.DBus.Error.LimitsExceeded",
+                b"Too many calls to " + method.name + b" pending")
     except SdbusError as e:
         method.loop.call_exception_handler({'message': str(e), 'exception': e})
+    method.service.sent()
+
+cdef _method_admit(Method method, Message message, list args):
+    cdef Service service = method.service
+    cdef MethodLimits limits = method.limits
+
+    if service.max_methods and (service.n_methods >= service.max_methods):
+        _method_reject(method, message)
+        return
+
+    if limits is not None and limits.concurrency and \
+            (limits.active >= limits.concurrency):
+        if limits.queue_limit >= 0 and \
+                (len(limits.waiting) >= limits.queue_limit):
+            limits.rejected += 1
+            _method_reject(method, message)
+            return
+
+        limits.waiting.append((method, message, args))
+        service.n_methods += 1
+        return
+
+    service.n_methods += 1
+    if limits is not None:
+        limits.active += 1
+    _method_start(method, message, args)
+
+cdef _method_done(Method method):
+    cdef MethodLimits limits = method.limits
+    cdef MethodLane lane = method.lane
+    cdef Method next_method
+    cdef Message next_message
+    cdef list next_args
+
+    if lane is not None and not method.coroutine:
+        if lane.waiting and method.service.process_loop:
+            next_method, next_message, next_args = lane.waiting.popleft()
+            _method_executor(next_method, next_message, next_args)
+        else:
+            lane.busy = False
+
+    method.service.n_methods -= 1
+    if limits is None:
+        return
+
+    limits.active -= 1
+    if limits.waiting and method.service.process_loop:
+        next_method, next_message, next_args = limits.waiting.popleft()
+        limits.active += 1
+        _method_start(next_method, next_message, next_args)
 
 cdef int method_message_handler(sdbus_h.sd_bus_message *m,
         void *userdata, sdbus_h.sd_bus_error *err) noexcept:
@@ -36,11 +242,65 @@ cdef int method_message_handler(sdbus_h.sd_bus_message *m,
     cdef PyObject *method_ptr = (((<PyObject**>userdata)[0]))
     cdef Method method = <Method>method_ptr
     cdef Message message = Message()
+    cdef list args
 
     message.import_sd_bus_message(m)
-    method.loop.run_in_executor(method.executor, _method_message_handler, method, message)
+
+    # read before the call is admitted, so a bad argument is replied to
+    # without holding a place in the limits
+    try:
+        args = message.read(method.arg_signature)
+    except Exception as e:
+        _method_error(method, message, e)
+        method.service.sent()
+        return 1
+
+    if method.inline and not method.coroutine:
+        _method_message_handler(method, message, args)
+    else:
+        _method_admit(method, message, args)
     return 1
 
+cdef class MethodLane:
+    """Runs an object's non-threadsafe method calls one at a time, in
+    the order they were received, other objects' calls run in parallel."""
+    cdef bint busy
+    cdef object waiting
+
+    def __cinit__(self):
+        self.busy = False
+        self.waiting = deque()
+
+cdef class MethodLimits:
+    """Limits the number of calls to a method that run at once, calls
+    over the concurrency limit wait to run, and calls over the queue limit
+    are rejected, ie. shared by all of the objects with a method."""
+    cdef stdint.uint64_t concurrency
+    cdef stdint.int64_t queue_limit
+    cdef stdint.uint64_t active
+    cdef stdint.uint64_t rejected
+    cdef object waiting
+
+    def __cinit__(self, concurrency=None, queue_limit=None):
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("Concurrency must be at least 1, or None")
+        if queue_limit is not None and queue_limit < 0:
+            raise ValueError("Queue limit can't be negative")
+
+        self.concurrency = concurrency or 0
+        self.queue_limit = -1 if queue_limit is None else queue_limit
+        self.active = 0
+        self.rejected = 0
+        self.waiting = deque()
+
+    def stats(self):
+        """Counters of calls running, waiting to run, and rejected."""
+        return {
+            'active': self.active,
+            'queued': len(self.waiting),
+            'rejected': self.rejected,
+        }
+
 cdef class Method:
 
     cdef stdint.uint8_t type
@@ -56,9 +316,22 @@ cdef class Method:
     cdef bool connected
     cdef object loop
     cdef object executor
+    cdef Service service
+    cdef bint coroutine
+    cdef bint inline
+    cdef set tasks
+    cdef MethodLimits limits
+    cdef bint serialize
+    cdef MethodLane lane
+    cdef bint process
 
     def __cinit__(self, name, callback, arg_signature='', return_signature='',
-            deprecated=False, hidden=False, unprivileged=False, no_reply=False, instance=None, executor=None):
+            deprecated=False, hidden=False, unprivileged=False, no_reply=False, instance=None, executor=None,
+            inline=False, MethodLimits limits=None, serialize=False,
+            process=False):
+
+        if inline and serialize:
+            raise ValueError("An inline method can't be serialized")
 
         self.name = name.encode()
         self.arg_signature = arg_signature[1:].encode() if instance is not None else arg_signature.encode()
@@ -67,6 +340,13 @@ cdef class Method:
         self.py_instance = instance
         self.connected = False
         self.executor = executor
+        self.coroutine = iscoroutinefunction(callback)
+        self.inline = inline
+        self.tasks = set()
+        self.limits = limits
+        self.serialize = serialize
+        self.process = process
+        self.lane = None
 
         self.type = sdbus_h._SD_BUS_VTABLE_METHOD
 
@@ -107,3 +387,9 @@ cdef class Method:
         self.py_instance = None
 
         self.loop = object.loop
+        self.service = object.service
+
+        if self.serialize:
+            if object.lane is None:
+                object.lane = MethodLane()
+            self.lane = object.lane
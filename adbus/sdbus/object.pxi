@@ -10,14 +10,18 @@ cdef class Object:
     cdef bytes interface
     cdef list vtable
     cdef object loop
+    cdef Service service
+    cdef object lane
 
     def __cinit__(self, service, path, interface, vtable,
             deprecated=False, hidden=False):
+        self.lane = None
         self.vtable = vtable
         self.path = path.encode()
         self.interface = interface.encode()
         self.bus = (<Service>service).bus
         self.loop = (<Service>service).loop
+        self.service = service
 
         self._malloc()
         self._init_vtable(deprecated, hidden)
@@ -102,7 +106,9 @@ cdef class Object:
 
         ret = sdbus_h.sd_bus_emit_properties_changed_strv(self.bus, self.path,
             self.interface, names)
+        PyMem_Free(names)
+
         if ret < 0:
             raise SdbusError(f"Failed to emit changed: {errorcode[-ret]}", -ret)
 
-        PyMem_Free(names)
+        self.service.sent()
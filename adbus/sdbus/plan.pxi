@@ -0,0 +1,94 @@
+# == Copyright: 2023, CCX Technologies
+#cython: language_level=3
+
+# Signatures are compiled once into a tree of nodes, one node per complete
+# type, so reading and appending messages doesn't have to re-parse the
+# signature string for every container (or every element of an array).
+
+cdef bytes basic_types = b"ybnqiuxtdsogh"
+cdef bytes fixed_types = b"ybnqiuxtd"
+
+cdef class Node:
+    """Compiled D-Bus complete type."""
+    cdef char type
+    cdef bytes signature
+    cdef bytes contents
+    cdef tuple children
+    cdef bint fixed
+    cdef bint fixed_struct
+
+cdef dict signature_plans = {}
+cdef Py_ssize_t signature_plans_max = 512
+
+cdef Node _compile_node(bytes signature, Py_ssize_t *index):
+    cdef Node node = Node()
+    cdef Py_ssize_t start = index[0]
+    cdef Py_ssize_t length = len(signature)
+    cdef list children = []
+    cdef char end
+
+    if start >= length:
+        raise SdbusError(f"Incomplete signature {signature}")
+
+    node.type = signature[start]
+    index[0] += 1
+
+    if node.type == sdbus_h.SD_BUS_TYPE_ARRAY:
+        children.append(_compile_node(signature, index))
+        node.contents = signature[start+1:index[0]]
+
+    elif (node.type == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN) or \
+            (node.type == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN):
+        if node.type == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN:
+            end = sdbus_h.SD_BUS_TYPE_STRUCT_END
+        else:
+            end = sdbus_h.SD_BUS_TYPE_DICT_ENTRY_END
+
+        while True:
+            if index[0] >= length:
+                raise SdbusError(f"Incomplete signature {signature}")
+            if signature[index[0]] == end:
+                break
+            children.append(_compile_node(signature, index))
+
+        node.contents = signature[start+1:index[0]]
+        index[0] += 1
+
+        if (node.type == sdbus_h.SD_BUS_TYPE_DICT_ENTRY_BEGIN) and \
+                (len(children) != 2):
+            raise SdbusError(f"Dictionary entry must have two types {signature}")
+
+    elif (node.type != sdbus_h.SD_BUS_TYPE_VARIANT) and \
+            (node.type not in basic_types):
+        raise SdbusError(
+                f"Unsupported signature type {signature} -> {chr(node.type)}")
+
+    node.signature = signature[start:index[0]]
+    node.children = tuple(children)
+    node.fixed = node.type in fixed_types
+    node.fixed_struct = (node.type == sdbus_h.SD_BUS_TYPE_STRUCT_BEGIN) and \
+            bool(children) and all((<Node>c).fixed for c in children)
+    return node
+
+cdef list _compile_signature(bytes signature):
+    cdef list plan = []
+    cdef Py_ssize_t index = 0
+
+    while index < len(signature):
+        plan.append(_compile_node(signature, &index))
+
+    return plan
+
+cdef list _signature_plan(bytes signature):
+    cdef list plan = signature_plans.get(signature)
+
+    if plan is None:
+        plan = _compile_signature(signature)
+
+        # keeps the cache bounded, services only use a handful of
+        # signatures so in practice this should never be hit
+        if len(signature_plans) >= signature_plans_max:
+            signature_plans.clear()
+        signature_plans[signature] = plan
+
+    return plan
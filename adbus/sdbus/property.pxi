@@ -15,7 +15,10 @@ cdef int property_get_handler(sdbus_h.sd_bus *bus,
 
     try:
         value = getattr(<object>(property.instance), property.attr_name)
-        message.append(property.signature, value)
+        if property.snapshot_enabled:
+            property.copy_snapshot(message, value)
+        else:
+            message.append(property.signature, value)
     except Exception as e:
         property.loop.call_exception_handler({'message': f"{e} for {property.attr_name} <{property.signature}>", 'exception': e})
 
@@ -78,16 +81,26 @@ cdef class Property:
     cdef bytes signature
     cdef bool connected
     cdef object loop
+    cdef Service service
+    cdef bint snapshot_enabled
+    cdef Message snapshot
+    cdef object snapshot_value
+    cdef bint snapshot_valid
 
     def __cinit__(self, name, py_object, attr_name, signature='', read_only=False,
             deprecated=False, hidden=False, unprivileged=False,
-            emits_constant=False, emits_change=False, emits_invalidation=False):
+            emits_constant=False, emits_change=False, emits_invalidation=False,
+            snapshot=False, explicit=False):
 
         self.name = name.encode()
         self.py_instance = py_object
         self.attr_name = attr_name
         self.signature = signature.encode()
         self.connected = False
+        self.snapshot_enabled = snapshot
+        self.snapshot = None
+        self.snapshot_value = None
+        self.snapshot_valid = False
 
         if read_only:
             self.type = sdbus_h._SD_BUS_VTABLE_PROPERTY
@@ -113,6 +126,10 @@ cdef class Property:
         if emits_invalidation:
             self.flags |= sdbus_h.SD_BUS_VTABLE_PROPERTY_EMITS_INVALIDATION
 
+        if explicit:
+            # only read on its own, it isn't included in GetAll
+            self.flags |= sdbus_h.SD_BUS_VTABLE_PROPERTY_EXPLICIT
+
         self.x.member = self.name
         self.x.get = property_get_handler
         if not read_only:
@@ -140,6 +157,30 @@ cdef class Property:
         self.py_instance = None
 
         self.loop = object.loop
+        self.service = object.service
+
+    cdef copy_snapshot(self, Message message, object value):
+        cdef Message snapshot
+
+        if (not self.snapshot_valid) or (value is not self.snapshot_value):
+            # marked valid first, so if it's invalidated by another thread
+            # while this is encoding it's encoded again on the next read
+            self.snapshot_valid = True
+
+            snapshot = Message()
+            snapshot.new_snapshot(self.service)
+            snapshot.append(self.signature, value)
+            snapshot.seal()
+
+            self.snapshot = snapshot
+            self.snapshot_value = value
+
+        self.snapshot.copy_to(message)
+
+    def invalidate(self):
+        """Discard the encoded value, ie. if it was changed in place, the
+        next read encodes it again, safe to call from any thread."""
+        self.snapshot_valid = False
 
     def emit_changed(self):
         if not self.object:
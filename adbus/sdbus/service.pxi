@@ -1,6 +1,11 @@
 # Copyright: 2017-2021, CCX Technologies
 #cython: language_level=3
 
+cdef inline stdint.uint64_t _monotonic_usec():
+    cdef timespec ts
+    clock_gettime(CLOCK_MONOTONIC, &ts)
+    return ts.tv_sec * 1000000 + ts.tv_nsec // 1000
+
 cdef class Service:
     cdef sdbus_h.sd_bus *bus
     cdef bytes name
@@ -10,9 +15,36 @@ cdef class Service:
     cdef stdint.uint64_t flags
     cdef object loop
     cdef object startup_task
+    cdef int fd
+    cdef bint writing
+    cdef object timer
+    cdef stdint.uint64_t timer_usec
+    cdef stdint.uint64_t write_high
+    cdef stdint.uint64_t write_low
+    cdef list drain_waiters
+    cdef stdint.uint64_t budget_messages
+    cdef stdint.uint64_t budget_usec
+    cdef bint resume_pending
+    cdef stdint.uint64_t n_wakeups
+    cdef stdint.uint64_t n_processed
+    cdef stdint.uint64_t n_budget_hits
+    cdef object completions
+    cdef bint completions_pending
+    cdef dict pending_methods
+    cdef stdint.uint64_t method_token
+    cdef stdint.uint64_t max_methods
+    cdef stdint.uint64_t n_methods
+    cdef stdint.uint64_t n_methods_rejected
+    cdef dict signal_matches
+    cdef object route_signals
+    cdef sdbus_h.sd_bus_message *signal_message
+    cdef ReadPosition signal_position
 
     def __cinit__(self, name=None, loop=None, bus='system',
-            replace_existing=False, allow_replacement=False, queue=False):
+            replace_existing=False, allow_replacement=False, queue=False,
+            write_high_water=1024, write_low_water=None,
+            process_budget=None, process_budget_usec=None,
+            max_pending_methods=None, route_signals=False):
         cdef const char *unique
 
         if name:
@@ -22,6 +54,27 @@ cdef class Service:
         self.flags = 0
         self.connected = False
         self.loop = loop
+        self.writing = False
+        self.timer = None
+        self.timer_usec = stdint.UINT64_MAX
+        self.drain_waiters = []
+        self.set_write_limits(write_high_water, write_low_water)
+        self.resume_pending = False
+        self.n_wakeups = 0
+        self.n_processed = 0
+        self.n_budget_hits = 0
+        self.set_process_budget(process_budget, process_budget_usec)
+        self.completions = deque()
+        self.completions_pending = False
+        self.pending_methods = {}
+        self.method_token = 0
+        self.n_methods = 0
+        self.n_methods_rejected = 0
+        self.set_method_limit(max_pending_methods)
+        self.signal_matches = {}
+        self.route_signals = route_signals
+        self.signal_message = NULL
+        self.signal_position = None
 
         if bus == 'system':
             if sdbus_h.sd_bus_open_system(&self.bus) < 0:
@@ -54,6 +107,7 @@ cdef class Service:
         bus_fd = sdbus_h.sd_bus_get_fd(self.bus)
         if bus_fd <= 0:
             raise BusError("Failed to read sd-bus file descriptor")
+        self.fd = bus_fd
 
         if not loop:
             loop = get_event_loop()
@@ -69,7 +123,14 @@ cdef class Service:
         bus_fd = sdbus_h.sd_bus_get_fd(self.bus)
         if bus_fd > 0:
             self.loop.remove_reader(bus_fd)
+            if self.writing:
+                self.loop.remove_writer(bus_fd)
+                self.writing = False
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
         self.process_loop = False
+        self._wake_drain_waiters()
 
         self.bus = sdbus_h.sd_bus_flush_close_unref(self.bus)
 
@@ -87,24 +148,128 @@ cdef class Service:
         """Get the service's asyncio loop."""
         return self.loop
 
+    def can_pass_fds(self):
+        """The bus connection supports passing Unix File Descriptors."""
+        return sdbus_h.sd_bus_can_send(self.bus, sdbus_h.SD_BUS_TYPE_UNIX_FD) > 0
+
+    def n_queued_read(self):
+        """Number of received messages waiting to be processed."""
+        cdef stdint.uint64_t queued
+        cdef int ret = sdbus_h.sd_bus_get_n_queued_read(self.bus, &queued)
+        if ret < 0:
+            raise BusError(f"Failed to read queue: {errorcode[-ret]}")
+        return queued
+
+    def n_queued_write(self):
+        """Number of messages waiting to be sent."""
+        cdef stdint.uint64_t queued
+        cdef int ret = sdbus_h.sd_bus_get_n_queued_write(self.bus, &queued)
+        if ret < 0:
+            raise BusError(f"Failed to read queue: {errorcode[-ret]}")
+        return queued
+
+    def set_write_limits(self, high, low=None):
+        """Set the outbound queue's high and low-water marks, in messages,
+        if low is None it's half of high, only drain() uses them, emits
+        aren't limited."""
+        if low is None:
+            low = high // 2
+        if low > high:
+            raise ValueError("Low-water mark can't be above the high-water mark")
+        self.write_high = high
+        self.write_low = low
+
+    async def drain(self):
+        """Wait for the outbound queue to drain, if it's over the
+        high-water mark wait until it's at or below the low-water mark."""
+        if self.n_queued_write() <= self.write_high:
+            return
+
+        future = self.loop.create_future()
+        self.drain_waiters.append(future)
+        self.update_events()
+        await future
+
+    cdef _wake_drain_waiters(self):
+        cdef list waiters = self.drain_waiters
+        self.drain_waiters = []
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+    def set_process_budget(self, messages=None, usec=None):
+        """Limit how much process() does per wakeup, after processing this
+        many messages, or for this many microseconds, it yields to the loop
+        and continues on its next iteration, None or 0 is unlimited."""
+        if (messages is not None and messages < 0) or \
+                (usec is not None and usec < 0):
+            raise ValueError("Budget can't be negative")
+        self.budget_messages = messages or 0
+        self.budget_usec = usec or 0
+
+    def process_stats(self):
+        """Counters of process() wakeups, messages processed, and times the
+        budget ran out with messages still waiting."""
+        return {
+            'wakeups': self.n_wakeups,
+            'processed': self.n_processed,
+            'budget_hits': self.n_budget_hits,
+        }
+
+    def set_method_limit(self, max_pending=None):
+        """Limit the number of method calls running, or waiting to run, at
+        once, calls over it are rejected, None is unlimited."""
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("Limit must be at least 1, or None")
+        self.max_methods = max_pending or 0
+
+    def method_stats(self):
+        """Counters of method calls pending (running, or waiting to run)
+        and rejected because a limit was exceeded."""
+        return {
+            'pending': self.n_methods,
+            'rejected': self.n_methods_rejected,
+        }
+
+    def signal_stats(self):
+        """Number of signal match 'rules' added to the bus, and the
+        number of 'listens' sharing them."""
+        return {
+            'rules': len(self.signal_matches),
+            'listens': sum((<SignalMatch>m).n_listens
+                for m in self.signal_matches.values()),
+        }
+
     async def startup_process(self):
         self.process()
 
     def process(self):
-        """Processes all available transactions from the D-Bus.
+        """Processes available transactions from the D-Bus, up to the
+        process budget, any left are processed on the loop's next iteration.
 
         Raises:
             sdbus.BusError: if an error occurs interfacing with the D-Bus
             Exception: re-raised if raised by any callbacks, or property setters
         """
 
+        cdef int r
+        cdef stdint.uint64_t count = 0
+        cdef stdint.uint64_t start = 0
+
         if self.connected:
             raise BusError(f"Already processing")
 
+        if self.budget_usec:
+            start = _monotonic_usec()
+
         self.connected = True
+        self.n_wakeups += 1
         try:
             while self.process_loop:
                 r = sdbus_h.sd_bus_process(self.bus, NULL)
+                # only valid while the signal is being dispatched
+                self.signal_message = NULL
+                self.signal_position = None
 
                 if r < 0:
                     raise BusError(f"D-Bus Process Error: {errorcode[-r]}")
@@ -112,5 +277,91 @@ cdef class Service:
                 if r == 0:
                     break
 
+                count += 1
+                if (self.budget_messages and (count >= self.budget_messages)) \
+                        or (self.budget_usec and
+                            (_monotonic_usec() - start >= self.budget_usec)):
+                    # messages already read from the socket won't wake the
+                    # reader, so continue after other callbacks have run
+                    self.n_budget_hits += 1
+                    if not self.resume_pending:
+                        self.resume_pending = True
+                        self.loop.call_soon(self._process_resume)
+                    break
+
         finally:
+            self.n_processed += count
             self.connected = False
+            self.update_events()
+
+    def _process_resume(self):
+        self.resume_pending = False
+        if self.process_loop:
+            self.process()
+
+    cpdef update_events(self):
+        """Watches for the events sd-bus is waiting for, the socket
+        being writable if messages are queued, and its next timeout.
+
+        Must be called from the loop's thread.
+        """
+        cdef int events
+        cdef stdint.uint64_t usec
+
+        if not self.process_loop:
+            return
+
+        if self.drain_waiters and (self.n_queued_write() <= self.write_low):
+            self._wake_drain_waiters()
+
+        events = sdbus_h.sd_bus_get_events(self.bus)
+        if events < 0:
+            raise BusError(f"D-Bus Events Error: {errorcode[-events]}")
+
+        if events & sdbus_h.POLLOUT:
+            if not self.writing:
+                self.loop.add_writer(self.fd, self.process)
+                self.writing = True
+        elif self.writing:
+            self.loop.remove_writer(self.fd)
+            self.writing = False
+
+        if sdbus_h.sd_bus_get_timeout(self.bus, &usec) < 0:
+            usec = stdint.UINT64_MAX
+
+        if usec != self.timer_usec:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+
+            # sd-bus and asyncio both use the monotonic clock
+            self.timer_usec = usec
+            if usec != stdint.UINT64_MAX:
+                self.timer = self.loop.call_at(usec / 1e6, self._process_timeout)
+
+    def _process_timeout(self):
+        self.timer = None
+        self.timer_usec = stdint.UINT64_MAX
+        self.process()
+
+    cdef ReadPosition read_position(self, sdbus_h.sd_bus_message *m):
+        """The read position of a signal being dispatched, shared by all
+        of the listens, and match rules, it's dispatched to."""
+        if self.signal_message != m:
+            self.signal_message = m
+            self.signal_position = ReadPosition()
+        return self.signal_position
+
+    cdef sent(self):
+        # sending can leave messages queued, or add a call's timeout
+        try:
+            running = get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self.loop:
+            self.update_events()
+        else:
+            # from another thread, ie. a call made from a worker thread,
+            # always, as even a sent call's reply timeout has to be armed
+            self.loop.call_soon_threadsafe(self.update_events)
@@ -13,6 +13,7 @@ cdef class Signal:
     cdef sdbus_h.sd_bus *bus
     cdef bytes path
     cdef bytes interface
+    cdef Service service
 
     def __cinit__(self, name, signature=(), deprecated=False, hidden=False):
 
@@ -44,6 +45,7 @@ cdef class Signal:
         self.bus = object.bus
         self.path = object.path
         self.interface = object.interface
+        self.service = object.service
 
     def emit(self, *values):
         message = Message()
@@ -56,4 +58,4 @@ cdef class Signal:
                         f"Signal expects {len(self.signature)} arguments "
                         f"but received {len(values)}.")
         message.send()
-
+        self.service.sent()
@@ -29,16 +29,93 @@ cdef bytes _object_signature_basic(object obj):
         return signature_variant
     return signature_invalid
 
+# signatures of basic values, by exact type
+cdef dict basic_signatures = {
+    bool: signature_boolean,
+    int: signature_int,
+    float: signature_float,
+    str: signature_string,
+    bytes: signature_string,
+}
+
+# signatures of types and typing annotations, they never change so are
+# only calculated once, bounded like the signature plans
+cdef dict type_signatures = {}
+cdef Py_ssize_t type_signatures_max = 512
+
+cdef bint _list_is_array(list obj):
+    # every element is checked, so is O(n), a declared signature (ie. the
+    # arg_signature of a call, or a proxy's introspected one) skips this
+    cdef object first = type(obj[0])
+
+    for v in obj:
+        if (type(v) is not first) and not isinstance(v, first):
+            return False
+    return True
+
+cdef bytes _buffer_signature(str code, Py_ssize_t itemsize):
+    # arrays that describe their element type, array.array and numpy.ndarray
+    if code in "bhilqnp":
+        if itemsize == 2:
+            return signature_array + b'n'
+        elif itemsize == 4:
+            return signature_array + b'i'
+        elif itemsize == 8:
+            return signature_array + b'x'
+    elif code in "BHILQNP":
+        if itemsize == 1:
+            return signature_array + signature_byte
+        elif itemsize == 2:
+            return signature_array + b'q'
+        elif itemsize == 4:
+            return signature_array + b'u'
+        elif itemsize == 8:
+            return signature_array + b't'
+    elif code in "fd":
+        return signature_array + signature_float
+    elif code == "?":
+        return signature_array + signature_boolean
+    return signature_invalid
+
+cdef bytes _type_signature(object obj):
+    cdef bytes signature
+
+    try:
+        signature = type_signatures.get(obj)
+    except TypeError:
+        # unhashable typing arguments
+        return _object_signature_uncached(obj)
+
+    if signature is None:
+        signature = _object_signature_uncached(obj)
+        if len(type_signatures) >= type_signatures_max:
+            type_signatures.clear()
+        type_signatures[obj] = signature
+
+    return signature
+
 cdef bytes _object_signature(object obj):
-    cdef bytes signature = b''
+    cdef bytes signature
 
     if obj is None:
+        return b''
+
+    signature = basic_signatures.get(type(obj))
+    if signature is not None:
         return signature
 
     if hasattr(obj, 'dbus_signature'):
         return obj.dbus_signature.encode('utf-8')
 
-    elif isinstance(obj, dict):
+    if isinstance(obj, (type, _GenericAlias)):
+        return _type_signature(obj)
+
+    return _object_signature_uncached(obj)
+
+cdef bytes _object_signature_uncached(object obj):
+    cdef bytes signature = b''
+
+    if isinstance(obj, dict):
         signature += signature_array
         signature += signature_dict_begin
         signature += _object_signature_basic(next(iter(obj.keys())))
@@ -47,7 +124,7 @@ cdef bytes _object_signature(object obj):
 
     elif isinstance(obj, list):
         try:
-            if all(isinstance(v, type(obj[0])) for v in obj):
+            if _list_is_array(obj):
                 # if all the same type it's an array
                 signature += signature_array
                 signature += _object_signature(obj[0])
@@ -66,6 +143,13 @@ cdef bytes _object_signature(object obj):
             signature += _object_signature(v)
         signature += signature_struct_end
 
+    elif isinstance(obj, array):
+        signature += _buffer_signature(obj.typecode, obj.itemsize)
+
+    elif (sys.modules.get('numpy') is not None) and \
+            isinstance(obj, sys.modules['numpy'].ndarray) and (obj.ndim == 1):
+        signature += _buffer_signature(obj.dtype.char, obj.dtype.itemsize)
+
     elif isinstance(obj, _GenericAlias) and (obj.__origin__ == dict):
         signature += signature_array
         signature += signature_dict_begin
@@ -107,8 +191,10 @@ def dbus_signature(obj):
             If the object has a dbus_signature attribute it will
             be used, otherwise the object or type will be parsed
             to calculate the D-Bus Signature.
-            Supports bool, int, str, float, bytes, and from the
-            typing library, List, Dict, and Tuple.
+            Supports bool, int, str, float, bytes, array.array,
+            numpy.ndarray, and from the typing library, List, Dict,
+            and Tuple. Signatures of types are cached, lists are
+            arrays if all their elements are the same type.
 
     Returns:
         A string representing the D-Bus Signature.
@@ -3,6 +3,12 @@
 
 from libc cimport stdint
 
+cdef extern from "poll.h":
+
+    cdef enum:
+        POLLIN
+        POLLOUT
+
 cdef extern from "systemd/sd-bus-protocol.h":
 
     cdef enum:
@@ -134,6 +140,11 @@ cdef extern from "systemd/sd-bus.h":
 
     int sd_bus_process(sd_bus *bus, sd_bus_message **r)
     int sd_bus_get_fd(sd_bus *bus)
+    int sd_bus_can_send(sd_bus *bus, char type)
+    int sd_bus_get_events(sd_bus *bus)
+    int sd_bus_get_timeout(sd_bus *bus, stdint.uint64_t *timeout_usec)
+    int sd_bus_get_n_queued_read(sd_bus *bus, stdint.uint64_t *ret)
+    int sd_bus_get_n_queued_write(sd_bus *bus, stdint.uint64_t *ret)
 
     int sd_bus_message_new_method_return(sd_bus_message *call,
             sd_bus_message **m)
@@ -145,7 +156,12 @@ cdef extern from "systemd/sd-bus.h":
     int sd_bus_message_set_expect_reply(sd_bus_message *m, int expect_reply)
 
     const char *sd_bus_message_get_signature(sd_bus_message *m, int complete)
+    const char *sd_bus_message_get_path(sd_bus_message *m)
+    const char *sd_bus_message_get_interface(sd_bus_message *m)
+    const char *sd_bus_message_get_member(sd_bus_message *m)
     int sd_bus_message_read_basic(sd_bus_message *m, char type, void *p)
+    int sd_bus_message_read_array(sd_bus_message *m, char type,
+            const void **ptr, size_t *size)
 
     const sd_bus_error *sd_bus_message_get_error(sd_bus_message *m)
     int sd_bus_message_get_errno(sd_bus_message *m)
@@ -155,6 +171,12 @@ cdef extern from "systemd/sd-bus.h":
     int sd_bus_message_enter_container(sd_bus_message *m, char type,
             const char *contents)
     int sd_bus_message_at_end(sd_bus_message *m, int complete)
+    int sd_bus_message_skip(sd_bus_message *m, const char *types)
+    int sd_bus_message_rewind(sd_bus_message *m, int complete)
+    int sd_bus_message_copy(sd_bus_message *m, sd_bus_message *source,
+            int all)
+    int sd_bus_message_seal(sd_bus_message *m, stdint.uint64_t cookie,
+            stdint.uint64_t timeout_usec)
     int sd_bus_message_exit_container(sd_bus_message *m)
     int sd_bus_message_close_container(sd_bus_message *m)
 
@@ -170,6 +192,8 @@ cdef extern from "systemd/sd-bus.h":
     int sd_bus_error_copy(sd_bus_error *dest, const sd_bus_error *e)
 
     int sd_bus_message_append_basic(sd_bus_message *m, char type, const void *p)
+    int sd_bus_message_append_array(sd_bus_message *m, char type,
+            const void *ptr, size_t size)
     int sd_bus_send(sd_bus *bus, sd_bus_message *m, stdint.uint64_t *cookie)
 
     int sd_bus_emit_properties_changed_strv(sd_bus *bus, const char *path,
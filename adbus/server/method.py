@@ -3,6 +3,9 @@
 
 import inspect
 import threading
+import functools
+import importlib
+import concurrent.futures
 
 from .. import sdbus
 
@@ -14,6 +17,14 @@ class Method:
     the method decorator applied to methods on a class that is a subclass of
     the main Object type.
 
+    If the callback is a coroutine function it's run as a task in the
+    service's loop, and the reply is sent once it completes.
+
+    If the executor is a concurrent.futures.ProcessPoolExecutor the
+    callback is run in a worker process, only the callback's name and the
+    arguments are sent to it so it must be a function, or a staticmethod
+    of a class, that can be imported from its module.
+
     Args:
         callback (function): function that will be called when
             D-Bus method is called, it should use new style type
@@ -39,11 +50,28 @@ class Method:
         threadsafe (bool): optional, if the method isn't threadsafe
             (False) the object will lock, so that only one of the
             objects non-threadsafe methods can run at a time,
-            default is True
+            calls from the D-Bus wait their turn in order without
+            occupying an executor thread, default is True, it can't be
+            False for inline or coroutine methods, they run in the loop
             **NOTE: this will only work if this is decorating a class
             method, as the lock has to be connected to the method**
         executor (concurrent.futures.Executor): optional, executor
-            to schedule callback calls on, None will use the default executor
+            to schedule callback calls on, None will use the default
+            executor, can be a ProcessPoolExecutor for CPU bound methods,
+            which can't be used with inline, threadsafe=False, or
+            coroutines
+        inline (bool): optional, if true the callback is called directly
+            from the service's loop instead of being scheduled on the
+            executor, only use for callbacks that return quickly and
+            don't block, inline calls aren't limited, so it can't be
+            used with concurrency or queue_limit, default is False
+        concurrency (int): optional, maximum number of calls to this method,
+            on all objects, that can run at once, others wait for one to
+            complete, None is unlimited
+        queue_limit (int): optional, maximum number of calls that can wait
+            to run if concurrency is limited, calls over it are rejected
+            with a org.freedesktop.DBus.Error.LimitsExceeded error, None is
+            unlimited
 
     Raises:
         BusError: if an error occurs during initialization
@@ -60,7 +88,14 @@ class Method:
             dont_block=False,
             threadsafe=True,
             executor=None,
+            inline=False,
+            concurrency=None,
+            queue_limit=None,
     ):
+        self.static = isinstance(callback, staticmethod)
+        if self.static:
+            callback = callback.__func__
+
         if not name:
             name = callback.__name__
 
@@ -77,6 +112,11 @@ class Method:
         self.hidden = hidden
         self.unprivileged = unprivileged
         self.executor = executor
+        self.inline = inline
+        self.limits = sdbus.MethodLimits(concurrency, queue_limit)
+        self.process = isinstance(
+                executor, concurrent.futures.ProcessPoolExecutor
+        )
 
         self.arg_signature = ''
         sig = inspect.signature(callback)
@@ -96,10 +136,39 @@ class Method:
 
         self.threadsafe = threadsafe
 
+        if inline and not threadsafe:
+            raise ValueError(
+                    f"{name} can't be inline and not threadsafe, "
+                    "waiting for the lock would block the loop"
+            )
+        if inline and (concurrency is not None or queue_limit is not None):
+            raise ValueError(
+                    f"{name} can't be inline and limited, inline calls "
+                    "run as soon as they're received"
+            )
+        if inspect.iscoroutinefunction(callback) and not threadsafe:
+            raise ValueError(
+                    f"{name} is a coroutine, it runs in the loop so can't "
+                    "be locked with threadsafe=False"
+            )
+        if self.process and (inline or not threadsafe):
+            raise ValueError(
+                    f"{name} runs in a worker process, so can't be inline "
+                    "or locked with threadsafe=False"
+            )
+        if self.process and inspect.iscoroutinefunction(callback):
+            raise ValueError(
+                    f"{name} is a coroutine, it runs in the loop so can't "
+                    "run in a process pool"
+            )
+
     def __get__(self, instance, owner):
         if instance is None:
             return self
 
+        if self.static:
+            return self.callback
+
         d = self
 
         def mfactory(self, *args, **kwargs):
@@ -110,22 +179,79 @@ class Method:
 
     def __call__(self, *args, **kwargs):
         if not self.threadsafe:
-            obj = self.callback.__self__
-            if not hasattr(obj, '_adbus_object_lock'):
-                obj._adbus_object_lock = threading.RLock()
-            with obj._adbus_object_lock:
+            # setdefault is atomic, so only one lock is ever used
+            lock = args[0].__dict__.setdefault(
+                    '_adbus_object_lock', threading.RLock()
+            )
+            with lock:
                 return self.callback(*args, **kwargs)
         else:
             return self.callback(*args, **kwargs)
 
+    def stats(self):
+        """Call counters.
+
+        Returns:
+            dict with the number of calls 'active' (running), 'queued'
+            (waiting to run), and 'rejected'
+        """
+        return self.limits.stats()
+
     def vt(self, instance=None):
+        if self.static:
+            instance = None
+
+        if self.process:
+            if instance is not None:
+                raise TypeError(
+                        f"{self.callback.__qualname__} can't run in a "
+                        "process, it must be a function or a staticmethod"
+                )
+            return sdbus.Method(
+                    self.dbus_name,
+                    functools.partial(
+                            _process_call, self.callback.__module__,
+                            self.callback.__qualname__
+                    ),
+                    self.arg_signature,
+                    self.return_signature,
+                    self.deprecated,
+                    self.hidden,
+                    self.unprivileged,
+                    self.dont_block,
+                    None,
+                    self.executor,
+                    limits=self.limits,
+                    process=True
+            )
+
+        serialize = not self.threadsafe and \
+                not inspect.iscoroutinefunction(self.callback)
+
         return sdbus.Method(
-                self.dbus_name, self.callback, self.arg_signature,
-                self.return_signature, self.deprecated, self.hidden,
-                self.unprivileged, self.dont_block, instance, self.executor
+                self.dbus_name, self.__call__ if serialize else self.callback,
+                self.arg_signature, self.return_signature, self.deprecated,
+                self.hidden, self.unprivileged, self.dont_block, instance,
+                self.executor, self.inline, self.limits, serialize
         )
 
 
+def _process_call(module, qualname, *args):
+    # runs in a worker process, the callback is looked up by name as
+    # the Method decorating it hides it from pickle
+    callback = importlib.import_module(module)
+    for name in qualname.split('.'):
+        callback = vars(callback)[name] if isinstance(callback, type) \
+                else getattr(callback, name)
+
+    if isinstance(callback, Method):
+        callback = callback.callback
+    elif isinstance(callback, staticmethod):
+        callback = callback.__func__
+
+    return callback(*args)
+
+
 def method(
         name=None,
         deprecated=False,
@@ -134,7 +260,10 @@ def method(
         camel_convert=True,
         dont_block=False,
         threadsafe=True,
-        executor=None
+        executor=None,
+        inline=False,
+        concurrency=None,
+        queue_limit=None
 ):
     """D-Bus Method Decorator.
 
@@ -144,6 +273,9 @@ def method(
         ie function(x: int, y: str) -> bool:
         if no type is defined a D-Bus Variant will be used
 
+        The decorated method can be a coroutine function (async def),
+        it will be run as a task in the service's loop.
+
     Args:
         name (str): optional, if set this name will be used on
             the D-Bus, instead of the decorated function's name
@@ -164,11 +296,26 @@ def method(
         threadsafe (bool): optional, if the method isn't threadsafe
             (False) the object will lock, so that only one of the
             objects non-threadsafe methods can run at a time,
-            default is True
+            calls from the D-Bus wait their turn in order without
+            occupying an executor thread, default is True, it can't be
+            False for inline or coroutine methods, they run in the loop
             **NOTE: this will only work if this is decorating a class
             method, as the lock has to be connected to the method**
         executor (concurrent.futures.Executor): optional, executor
-            to schedule callback calls on, None will use the default executor
+            to schedule callback calls on, None will use the default
+            executor, can be a ProcessPoolExecutor for CPU bound methods
+        inline (bool): optional, if true the callback is called directly
+            from the service's loop instead of being scheduled on the
+            executor, only use for callbacks that return quickly and
+            don't block, inline calls aren't limited, so it can't be
+            used with concurrency or queue_limit, default is False
+        concurrency (int): optional, maximum number of calls to this method,
+            on all objects, that can run at once, others wait for one to
+            complete, None is unlimited
+        queue_limit (int): optional, maximum number of calls that can wait
+            to run if concurrency is limited, calls over it are rejected
+            with a org.freedesktop.DBus.Error.LimitsExceeded error, None is
+            unlimited
 
     Returns:
         Instantiated Method, which can be used to replace a method
@@ -185,7 +332,10 @@ def method(
                 camel_convert,
                 dont_block=dont_block,
                 threadsafe=threadsafe,
-                executor=executor
+                executor=executor,
+                inline=inline,
+                concurrency=concurrency,
+                queue_limit=queue_limit
         )
 
     return wrapper
@@ -2,6 +2,7 @@
 """D-Bus Object"""
 
 import asyncio
+import threading
 
 from .. import sdbus
 
@@ -19,6 +20,10 @@ class Object:
     or one property can be set multiple times, with a single D-Bus changed
     signal being sent for all property updates once the context is closed.
 
+    Alternatively property updates can be coalesced automatically, all of
+    the properties changed within a time window are sent in a single D-Bus
+    changed signal once it closes.
+
     Args:
         service (adbus.server.Service): service to connect to
         path (str): path to create on the service
@@ -36,6 +41,14 @@ class Object:
             to the introspect XML data
         manager (bool): optional, if True add a device manager to this object,
             as defined by the D-Bus Spec from freedesktop.org
+        coalesce_window (float): optional, if set property changes are
+            sent once no property has changed for this many seconds, if
+            None uses the service's property_coalesce_window, 0 sends
+            changes immediately
+        coalesce_max_delay (float): optional, longest time, in seconds, a
+            property change can be held back while other properties keep
+            changing, if None uses the service's
+            property_coalesce_max_delay, or the window if that's not set
 
     Raises:
         BusError: if an error occurs during initialization
@@ -51,19 +64,41 @@ class Object:
             deprecated=False,
             hidden=False,
             manager=False,
+            coalesce_window=None,
+            coalesce_max_delay=None,
     ):
         self._defer_properties = False
         self._deferred_property_signals = {}
 
+        if coalesce_window is None:
+            coalesce_window = getattr(service, 'property_coalesce_window', 0)
+        if coalesce_max_delay is None:
+            coalesce_max_delay = getattr(
+                    service, 'property_coalesce_max_delay', None
+            )
+
+        self._coalesce_window = coalesce_window or 0
+        self._coalesce_max_delay = max(
+                coalesce_max_delay or 0, self._coalesce_window
+        )
+        self._coalesce_lock = threading.Lock()
+        self._coalesced_property_signals = {}
+        self._coalesce_timer = None
+        self._coalesce_first = 0
+        self._coalesce_last = 0
+
         self.service = service
         self.path = path
 
         vtable = list(vtable)
-        vtable += [
-                v.vt(self)
-                for v in type(self).__dict__.values()
-                if hasattr(v, 'vt')
-        ]
+        for v in type(self).__dict__.values():
+            if hasattr(v, 'vt'):
+                # properties sending deltas also add a signal
+                entries = v.vt(self)
+                if isinstance(entries, list):
+                    vtable += entries
+                else:
+                    vtable.append(entries)
 
         self.sdbus = sdbus.Object(
                 service.sdbus, path, interface, vtable, deprecated, hidden
@@ -76,12 +111,54 @@ class Object:
         if self._defer_properties:
             self._deferred_property_signals[dbus_name.encode()] = True
 
+        elif self._coalesce_window and self.service.is_running():
+            with self._coalesce_lock:
+                self._coalesced_property_signals[dbus_name.encode()] = True
+
+            loop = self.service.get_loop()
+            if _running_loop() is loop:
+                self._coalesce_changes()
+            else:
+                loop.call_soon_threadsafe(self._coalesce_changes)
+
         elif self.service.is_running():
             asyncio.run_coroutine_threadsafe(
                     self.sdbus.emit_properties_changed([dbus_name.encode()]),
                     loop=self.service.get_loop()
             )
 
+    def _coalesce_changes(self):
+        loop = self.service.get_loop()
+        self._coalesce_last = loop.time()
+
+        # the timer isn't moved for every change, when it fires it's
+        # re-armed if changes are still arriving
+        if self._coalesce_timer is None:
+            self._coalesce_first = self._coalesce_last
+            self._coalesce_timer = loop.call_at(
+                    self._coalesce_last + self._coalesce_window,
+                    self._emit_coalesced
+            )
+
+    def _emit_coalesced(self):
+        loop = self.service.get_loop()
+        deadline = min(
+                self._coalesce_last + self._coalesce_window,
+                self._coalesce_first + self._coalesce_max_delay
+        )
+
+        if loop.time() < deadline:
+            self._coalesce_timer = loop.call_at(deadline, self._emit_coalesced)
+            return
+
+        self._coalesce_timer = None
+        with self._coalesce_lock:
+            names = list(self._coalesced_property_signals.keys())
+            self._coalesced_property_signals = {}
+
+        if names:
+            loop.create_task(self.sdbus.emit_properties_changed(names))
+
     def defer_property_updates(self, enable):
         if enable:
             self._defer_properties = True
@@ -110,3 +187,11 @@ class Object:
 
     def __exit__(self, exception_type, exception_value, exception_traceback):
         self.defer_property_updates(False)
+
+
+def _running_loop():
+    # the loop running in this thread, or None if it's another thread
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
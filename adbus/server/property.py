@@ -2,6 +2,7 @@
 """D-Bus Property"""
 
 from .. import sdbus
+from .object import _running_loop
 
 
 class Property:
@@ -35,6 +36,34 @@ class Property:
             methods and arguments are typically defined in Snake
             Case, if this is set the cases will be automatically
             converted between the two
+        snapshot (bool): optional, if True the property's value is only
+            encoded when it's first read after being set, and reads copy
+            the encoded value, use for large properties that are read
+            more often than they change, **if the value is changed in
+            place call emit_changed, or set it, to update it**
+        change_detection (str): optional, how a new value is compared to
+            the old one to decide if it has changed, 'equality' compares
+            the values, 'identity' only checks if it's a different object,
+            'hash' compares a hash of the value computed once when it's
+            set, and 'version' treats every set as a change
+        delta (bool): optional, for dictionary and list properties, if
+            True changes are sent on a {Name}Delta signal with only the
+            entries that changed and the property's version, instead of
+            sending the whole value in the properties changed signal, the
+            property is invalidated so other clients read the value,
+            dictionaries send (version, changed entries, removed keys),
+            and lists send (version, length, changed entries by index),
+            the value is also published with its version, as a read-only
+            {Name}Versioned property, (version, value), so clients know
+            which deltas are already in a value they read, it's only sent
+            when it's read on its own, it isn't included in GetAll or
+            emitted, so the value is never sent twice,
+            if the value was changed in place (emit_changed is called, or
+            the same object is set again) there's no old value to compare
+            with, so the version is sent negated with no changes, telling
+            clients to read the whole value, **working out the changes
+            compares every entry of the old and new values, so it's still
+            O(n), deltas reduce what's sent, not the work to send it**
     """
 
     def __init__(
@@ -49,7 +78,15 @@ class Property:
             emits_change=True,
             emits_invalidation=False,
             camel_convert=True,
+            snapshot=False,
+            change_detection='equality',
+            delta=False,
     ):
+        if change_detection not in _change_detection:
+            raise ValueError(
+                    f"Unknown change detection {change_detection}, expecting"
+                    f" one of {', '.join(_change_detection)}"
+            )
 
         self.default = default
         self.dbus_name = name
@@ -61,6 +98,12 @@ class Property:
         self.emits_change = emits_change and (not emits_invalidation)
         self.emits_invalidation = emits_invalidation
         self.camel_convert = camel_convert
+        self.snapshot = snapshot
+        self.changed = _change_detection[change_detection]
+        self.delta = delta
+        if delta:
+            self.emits_change = False
+            self.emits_invalidation = True
 
     def __get__(self, instance, owner):
         try:
@@ -72,13 +115,77 @@ class Property:
         if self.constant:
             raise ValueError("Can't change the value of a constant.")
 
-        if getattr(instance, self.py_name) != value:
+        self.invalidate(instance)
+
+        old_value = getattr(instance, self.py_name)
+        if self.changed(self, instance, old_value, value):
             instance.__dict__[self.py_name] = value
-            self.emit_changed(instance)
+            self._changed(instance, old_value, value)
 
-    def emit_changed(self, instance):
+    def _changed(self, instance, old_value, value):
+        version = self.version(instance) + 1
+        instance.__dict__.setdefault('_adbus_versions',
+                                     {})[self.py_name] = version
+
+        self.invalidate(instance)
         if self.emits_change or self.emits_invalidation:
             instance.emit_property_changed(self.dbus_name)
+        if self.delta:
+            # set together, so they're always read together
+            instance.__dict__['_adbus_versioned_' +
+                              self.py_name] = (version, value)
+            self.emit_delta(instance, version, old_value, value)
+
+    def version(self, instance):
+        """Number of times the property has changed."""
+        return instance.__dict__.get('_adbus_versions',
+                                     {}).get(self.py_name, 0)
+
+    def emit_delta(self, instance, version, old_value, value):
+        signal = instance.__dict__['_adbus_deltas'][self.py_name]
+
+        if old_value is value:
+            # changed in place, so clients have to read the whole value
+            if self.dbus_signature.startswith('a{'):
+                args = (-version, {}, [])
+            else:
+                args = (-version, len(value), {})
+
+        elif self.dbus_signature.startswith('a{'):
+            changed = {
+                    k: v
+                    for k, v in value.items()
+                    if (k not in old_value) or (old_value[k] != v)
+            }
+            removed = [k for k in old_value if k not in value]
+            args = (version, changed, removed)
+        else:
+            changed = {
+                    i: v
+                    for i, v in enumerate(value)
+                    if (i >= len(old_value)) or (old_value[i] != v)
+            }
+            args = (version, len(value), changed)
+
+        loop = instance.service.get_loop()
+        if _running_loop() is loop:
+            signal.emit(*args)
+        elif instance.service.is_running():
+            loop.call_soon_threadsafe(signal.emit, *args)
+
+    def invalidate(self, instance):
+        """Discard the property's encoded value, if it's a snapshot."""
+        if self.snapshot:
+            try:
+                instance.__dict__['_adbus_snapshots'][self.py_name
+                                                      ].invalidate()
+            except KeyError:
+                pass
+
+    def emit_changed(self, instance):
+        """Emit that the property changed, ie. if it was changed in place."""
+        value = getattr(instance, self.py_name)
+        self._changed(instance, value, value)
 
     def __set_name__(self, owner, name):
         self.py_name = name
@@ -96,11 +203,95 @@ class Property:
         if self.camel_convert:
             self.dbus_name = sdbus.snake_to_camel(self.dbus_name)
 
+        if self.delta and not self.dbus_signature.startswith('a'):
+            raise TypeError(
+                    f"{name} must be a dictionary or list to send deltas"
+            )
+
     def vt(self, instance):
         """Interface to sd-bus library"""
-        return sdbus.Property(
+        prop = sdbus.Property(
                 self.dbus_name, instance, self.py_name, self.dbus_signature,
                 self.read_only, self.deprecated, self.hidden,
                 self.unprivileged, self.constant, self.emits_change,
-                self.emits_invalidation
+                self.emits_invalidation, self.snapshot
+        )
+        if self.snapshot:
+            instance.__dict__.setdefault('_adbus_snapshots',
+                                         {})[self.py_name] = prop
+
+        if not self.delta:
+            return prop
+
+        # integers use the same type python's int is sent as
+        if self.dbus_signature.startswith('a{'):
+            key = self.dbus_signature[2]
+            signature = ('x', self.dbus_signature, 'a' + key)
+        else:
+            signature = ('x', 'x', 'a{x' + self.dbus_signature[1:] + '}')
+
+        signal = sdbus.Signal(
+                self.dbus_name + 'Delta', signature, self.deprecated,
+                self.hidden
+        )
+        instance.__dict__.setdefault('_adbus_deltas',
+                                     {})[self.py_name] = signal
+
+        versioned = '_adbus_versioned_' + self.py_name
+        instance.__dict__.setdefault(
+                versioned,
+                (self.version(instance), getattr(instance, self.py_name))
         )
+        versioned_prop = sdbus.Property(
+                self.dbus_name + 'Versioned',
+                instance,
+                versioned,
+                '(x' + self.dbus_signature + ')',
+                read_only=True,
+                deprecated=self.deprecated,
+                hidden=self.hidden,
+                emits_change=False,
+                emits_invalidation=False,
+                explicit=True
+        )
+        return [prop, signal, versioned_prop]
+
+
+def _hash(value):
+    # lists and dictionaries aren't hashable, so are converted
+    if isinstance(value, dict):
+        return hash(frozenset((k, _hash(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return hash(tuple(_hash(v) for v in value))
+    return hash(value)
+
+
+def _hash_changed(prop, instance, old_value, value):
+    hashes = instance.__dict__.setdefault('_adbus_hashes', {})
+    try:
+        old_hash = hashes[prop.py_name]
+    except KeyError:
+        old_hash = _hash(old_value)
+
+    hashes[prop.py_name] = _hash(value)
+    return hashes[prop.py_name] != old_hash
+
+
+def _equality_changed(prop, instance, old_value, value):
+    return old_value != value
+
+
+def _identity_changed(prop, instance, old_value, value):
+    return old_value is not value
+
+
+def _version_changed(prop, instance, old_value, value):
+    return True
+
+
+_change_detection = {
+        'equality': _equality_changed,
+        'identity': _identity_changed,
+        'hash': _hash_changed,
+        'version': _version_changed,
+}
@@ -2,6 +2,7 @@
 """D-Bus Service"""
 
 from . import sdbus
+from .client.call import PreparedCall
 
 
 class Service:
@@ -23,6 +24,37 @@ class Service:
         name_queue (bool): optional, if our name is in use by another
             service put ourselves in the D-Bus name queue, we will get
             name once the existing service relinquishes it
+        write_high_water (int): optional, number of outbound messages
+            queued (ie. when the bus daemon isn't keeping up) above which
+            drain() waits, it doesn't limit the queue, signals emitted
+            are always queued
+        write_low_water (int): optional, number of outbound messages queued
+            that drain() waits for, if None half of write_high_water
+        process_budget (int): optional, maximum number of messages to
+            process before yielding to other tasks in the loop, if None
+            (default) or 0 processes all that are available
+        process_budget_usec (int): optional, maximum time in microseconds
+            to spend processing messages before yielding to other tasks
+            in the loop, if None no time limit
+        max_pending_methods (int): optional, maximum number of method
+            calls served that can be running, or waiting to run, at once,
+            calls over it are rejected with a
+            org.freedesktop.DBus.Error.LimitsExceeded error, if None
+            unlimited
+        property_coalesce_window (float): optional, default for objects
+            served, if set property changes are sent once no property
+            has changed for this many seconds
+        property_coalesce_max_delay (float): optional, default for objects
+            served, longest time, in seconds, a property change can be
+            held back while other properties keep changing
+        route_signals: optional, listens with the same sender, path,
+            interface, member, and args always share one match rule on the
+            bus, if True listens (with at most one arg) share one rule per
+            sender, or if a list of path namespaces, ie. ['/com/awesome'],
+            one rule per sender and namespace the path is in, and signals
+            received are routed locally, this keeps the number of rules
+            low when listening to many objects, but the rules receive
+            signals that aren't listened to
 
     Raises:
         BusError: if an error occurs during initialization
@@ -35,20 +67,135 @@ class Service:
             bus='system',
             replace_existing=False,
             allow_replacement=False,
-            name_queue=False
+            name_queue=False,
+            write_high_water=1024,
+            write_low_water=None,
+            process_budget=None,
+            process_budget_usec=None,
+            max_pending_methods=None,
+            property_coalesce_window=None,
+            property_coalesce_max_delay=None,
+            route_signals=False,
     ):
         self.sdbus = sdbus.Service(
                 name, loop, bus, replace_existing, allow_replacement,
-                name_queue
+                name_queue, write_high_water, write_low_water, process_budget,
+                process_budget_usec, max_pending_methods, route_signals
         )
         """Interface to sd-bus library"""
 
+        self.property_coalesce_window = property_coalesce_window
+        """Default property change coalescing window for objects."""
+
+        self.property_coalesce_max_delay = property_coalesce_max_delay
+        """Default longest delay of coalesced property changes."""
+
     def is_running(self):
         return self.sdbus.is_running()
 
     def get_loop(self):
         return self.sdbus.get_loop()
 
+    def can_pass_fds(self):
+        return self.sdbus.can_pass_fds()
+
+    def n_queued_read(self):
+        """Number of received messages waiting to be processed."""
+        return self.sdbus.n_queued_read()
+
+    def n_queued_write(self):
+        """Number of messages waiting to be sent."""
+        return self.sdbus.n_queued_write()
+
+    def set_write_limits(self, high, low=None):
+        """Set the outbound queue's high and low-water marks.
+
+        The marks are only used by drain(), emitting a signal, or sending
+        any other message, never waits or fails because the queue is over
+        the high-water mark.
+
+        Args:
+            high (int): number of queued messages above which drain() waits
+            low (int): optional, number of queued messages drain() waits
+                for, if None half of high
+        """
+        self.sdbus.set_write_limits(high, low)
+
+    async def drain(self):
+        """Wait for the outbound queue to drain.
+
+        If more messages are queued than the high-water mark waits until
+        there are no more than the low-water mark, use to throttle bursts
+        of signals instead of letting them buffer in memory, emits aren't
+        limited, so code emitting in bursts has to await this itself.
+        """
+        await self.sdbus.drain()
+
+    def set_process_budget(self, messages=None, usec=None):
+        """Set how much work is done each time the service wakes up.
+
+        Messages left once the budget is used are processed on the loop's
+        next iteration, so a flood of messages doesn't starve other tasks.
+
+        Args:
+            messages (int): optional, maximum number of messages to
+                process per wakeup, if None or 0 unlimited
+            usec (int): optional, maximum time in microseconds to process
+                messages per wakeup, if None or 0 unlimited
+        """
+        self.sdbus.set_process_budget(messages, usec)
+
+    def process_stats(self):
+        """Message processing counters.
+
+        Returns:
+            dict with the number of 'wakeups', messages 'processed', and
+            'budget_hits', the times processing yielded with messages
+            still waiting
+        """
+        return self.sdbus.process_stats()
+
+    def set_method_limit(self, max_pending=None):
+        """Set the maximum number of method calls pending at once.
+
+        Args:
+            max_pending (int): optional, maximum number of method calls
+                served that can be running, or waiting to run, at once,
+                if None unlimited
+        """
+        self.sdbus.set_method_limit(max_pending)
+
+    def method_stats(self):
+        """Method call counters.
+
+        Returns:
+            dict with the number of method calls 'pending' (running, or
+            waiting to run), and 'rejected' because a limit was exceeded
+        """
+        return self.sdbus.method_stats()
+
+    def signal_stats(self):
+        """Signal match counters.
+
+        Returns:
+            dict with the number of match 'rules' added to the bus, and
+            the number of 'listens' sharing them
+        """
+        return self.sdbus.signal_stats()
+
+    def prepare_call(self, address, path, interface, method, *args, **kwargs):
+        """Prepare a D-Bus Method call to be called many times.
+
+        Takes the same arguments as adbus.client.PreparedCall.
+
+        Returns:
+            An adbus.client.PreparedCall, await it with the method's
+            arguments to make a call.
+        """
+        return PreparedCall(
+                self, address, path, interface, method, *args, **kwargs
+        )
+
     def stop(self):
         self.sdbus.stop()
 
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+# Copyright: 2023, CCX Technologies
+"""Message marshalling throughput, per signature.
+
+Calls an echo method on an object served by the same process, so every
+call appends and reads the payload twice (request and reply).
+
+Run from the root directory with:
+    dbus-run-session python benchmarks/bench_message.py
+"""
+
+import asyncio
+import time
+import typing
+
+import adbus
+
+service_name = 'adbus.bench'
+object_path = '/adbus/bench/Bench1'
+object_interface = 'adbus.bench'
+
+calls = 2000
+concurrency = 50
+
+
+class _Arg:
+
+    def __init__(self, signature, value):
+        self.dbus_signature = signature
+        self.dbus_value = value
+
+
+class BenchObject(adbus.server.Object):
+
+    def __init__(self, service):
+        super().__init__(service, object_path, object_interface)
+
+    @adbus.server.method()
+    def echo_asv(
+            self, value: typing.Dict[str, typing.Any]
+    ) -> typing.Dict[str, typing.Any]:
+        return value
+
+    @adbus.server.method()
+    def echo_asii(
+            self, value: typing.List[typing.Tuple[str, int, int]]
+    ) -> typing.List[typing.Tuple[str, int, int]]:
+        return value
+
+    @adbus.server.method()
+    def echo_ax(self, value: typing.List[int]) -> typing.List[int]:
+        return value
+
+    @adbus.server.method()
+    def echo_as(self, value: typing.List[str]) -> typing.List[str]:
+        return value
+
+
+payloads = {
+        'a{sv}': (
+                'EchoAsv', {
+                        f"key{i}": (i if i % 3 else f"value{i}")
+                        for i in range(32)
+                }
+        ),
+        'a(sxx)': ('EchoAsii', [(f"name{i}", i, -i) for i in range(32)]),
+        'ax': ('EchoAx', list(range(256))),
+        'as': ('EchoAs', [f"string{i}" for i in range(64)]),
+}
+
+
+async def bench(service, signature, method, value):
+
+    async def _call():
+        return await adbus.client.call(
+                service, service_name, object_path, object_interface, method,
+                (_Arg(signature, value), ), signature
+        )
+
+    await _call()
+
+    start = time.perf_counter()
+    for _ in range(calls // concurrency):
+        await asyncio.gather(*[_call() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    print(f"{signature:>8}: {calls / elapsed:10.1f} calls/s")
+
+
+def main():
+    loop = asyncio.get_event_loop()
+    service = adbus.Service(service_name, bus='session')
+    obj = BenchObject(service)
+
+    for signature, (method, value) in payloads.items():
+        loop.run_until_complete(bench(service, signature, method, value))
+
+    obj.detach()
+    service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+# Copyright: 2023, CCX Technologies
+"""Property reads awaited one at a time versus pipelined with call_many.
+
+Reads a property of an object served by the same process.
+
+Run from the root directory with:
+    dbus-run-session python benchmarks/bench_pipeline.py
+"""
+
+import asyncio
+import time
+
+import adbus
+
+service_name = 'adbus.bench'
+object_path = '/adbus/bench/Bench1'
+object_interface = 'adbus.bench'
+
+calls = 5000
+
+
+class BenchObject(adbus.server.Object):
+
+    value: int = adbus.server.Property(100)
+
+    def __init__(self, service):
+        super().__init__(service, object_path, object_interface)
+
+
+async def bench(service):
+    get = (
+            service_name, object_path, "org.freedesktop.DBus.Properties",
+            "Get", (object_interface, "Value"), "v"
+    )
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        await adbus.client.call(service, *get)
+    elapsed = time.perf_counter() - start
+    print(f"sequential: {elapsed * 1000:8.1f} ms")
+
+    start = time.perf_counter()
+    await adbus.client.call_many(service, [get] * calls)
+    elapsed = time.perf_counter() - start
+    print(f" pipelined: {elapsed * 1000:8.1f} ms")
+
+
+def main():
+    loop = asyncio.get_event_loop()
+    service = adbus.Service(service_name, bus='session')
+    obj = BenchObject(service)
+
+    loop.run_until_complete(bench(service))
+
+    obj.detach()
+    service.stop()
+
+
+if __name__ == "__main__":
+    main()
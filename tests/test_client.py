@@ -5,14 +5,23 @@
 
 import unittest
 import typing
+import array
 import asyncio
+import gc
+import os
 import random
+import signal
 import string
 import time
 from multiprocessing import Process
 
 import adbus
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 service_name = 'adbus.test'
 object_path = '/adbus/test/Tests1'
 object_interface = 'adbus.test'
@@ -34,6 +43,9 @@ class Test(unittest.TestCase):
 
     @classmethod
     def run_test_wait(cls):
+        # in its own process group, so its process pool's workers
+        # are stopped along with it
+        os.setpgrp()
         import test_server
         test_server.Test.setUpClass()
         test = test_server.Test()
@@ -50,7 +62,8 @@ class Test(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        cls.server.terminate()
+        os.killpg(cls.server.pid, signal.SIGTERM)
+        cls.server.join()
 
     @staticmethod
     async def delay(loops=10):
@@ -77,6 +90,155 @@ class Test(unittest.TestCase):
 
         self.loop.run_until_complete(asyncio.gather(call_basic(), ))
 
+    def test_call_cancel(self):
+
+        def pending():
+            return sum(
+                    isinstance(o, adbus.sdbus.Call) for o in gc.get_objects()
+            )
+
+        async def call_basic():
+            before = pending()
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                        adbus.client.call(
+                                self.service,
+                                "adbus.test",
+                                "/adbus/test/Tests1",
+                                "adbus.test",
+                                "SlowMethod",
+                                response_signature="s",
+                        ), 0.1
+                )
+            await asyncio.sleep(0)
+            self.assertEqual(pending(), before)
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_timeout(self):
+
+        async def call_basic():
+            start = time.monotonic()
+            with self.assertRaises(adbus.sdbus.SdbusError):
+                await adbus.client.call(
+                        self.service,
+                        "adbus.test",
+                        "/adbus/test/Tests1",
+                        "adbus.test",
+                        "SlowMethod",
+                        response_signature="s",
+                        timeout_ms=500
+                )
+            self.assertLess(time.monotonic() - start, 2)
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_async(self):
+
+        async def call_basic():
+            value = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "AsyncMethod", (10, "abc"),
+                    response_signature="x"
+            )
+            self.assertEqual(value, 16)
+
+            with self.assertRaises(adbus.sdbus.SdbusError):
+                await adbus.client.call(
+                        self.service,
+                        "adbus.test",
+                        "/adbus/test/Tests1",
+                        "adbus.test",
+                        "AsyncError",
+                        response_signature="s"
+                )
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_bad_return(self):
+
+        async def call_basic():
+            for method in ("BadReturn", "AsyncBadReturn", "InlineBadReturn"):
+                # replied to with the error, not left to time out
+                with self.assertRaisesRegex(
+                        adbus.sdbus.SdbusError, "System.Error"
+                ):
+                    await adbus.client.call(
+                            self.service,
+                            "adbus.test",
+                            "/adbus/test/Tests1",
+                            "adbus.test",
+                            method,
+                            response_signature="x",
+                            timeout_ms=2000
+                    )
+
+            # the failed replies mustn't hold a place in the limits
+            value = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "PendingMethods",
+                    response_signature="x"
+            )
+            self.assertEqual(value, 0)
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_limits(self):
+
+        async def call_basic():
+            values = await adbus.client.call_many(
+                    self.service, [
+                            (
+                                    "adbus.test", "/adbus/test/Tests1",
+                                    "adbus.test", "LimitedMethod", (), "x"
+                            )
+                    ] * 4
+            )
+            # one call runs, one waits, the rest are rejected
+            self.assertEqual(values[:2], [1, 1])
+            for value in values[2:]:
+                self.assertIn("LimitsExceeded", str(value))
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_serialized(self):
+
+        async def call_basic():
+            values = await adbus.client.call_many(
+                    self.service, [
+                            (
+                                    "adbus.test", "/adbus/test/Tests1",
+                                    "adbus.test", "SerialMethod", (), "x"
+                            )
+                    ] * 8
+            )
+            # non-threadsafe methods on an object never run concurrently
+            self.assertEqual(values, [1] * 8)
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_process(self):
+
+        async def call_basic():
+            value = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "ProcessMethod", ("ran in ", ),
+                    response_signature="s"
+            )
+            self.assertTrue(value.startswith("ran in "))
+            self.assertNotIn("run_test_wait", value)
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
     def test_call_complicated(self):
 
         async def call_basic():
@@ -99,6 +261,103 @@ class Test(unittest.TestCase):
 
         self.loop.run_until_complete(asyncio.gather(call_basic(), ))
 
+    def test_call_arg_signature(self):
+
+        async def call_basic():
+            value = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "TestMethod",
+                    args=(4, "test"),
+                    arg_signature="xs",
+                    response_signature="x",
+            )
+            self.assertEqual(value, 8)
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_prepared_call(self):
+
+        async def call_basic():
+            test_method = self.service.prepare_call(
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "TestMethod",
+                    "xs",
+                    "x",
+            )
+            for i in range(10):
+                self.assertEqual(await test_method(i, "test"), i + 4)
+
+            # cast to the declared types
+            self.assertEqual(await test_method(4.0, "test"), 8)
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_many(self):
+
+        async def call_basic():
+            get = (
+                    "adbus.test", "/adbus/test/Tests1",
+                    "org.freedesktop.DBus.Properties", "Get"
+            )
+            values = await adbus.client.call_many(
+                    self.service, [
+                            get + (("adbus.test", "Property3"), "v"),
+                            get + (("adbus.test", "NotAProperty"), "v"),
+                            get + (("adbus.test", "Property2"), "v"),
+                    ]
+            )
+            self.assertEqual(values[0], [1, 2, 3])
+            self.assertIsInstance(values[1], Exception)
+            self.assertIsInstance(values[2], int)
+
+            values = await adbus.client.call_many(
+                    self.service, [
+                            get + (("adbus.test", "Property3"), "v")
+                            for _ in range(100)
+                    ],
+                    concurrency=10
+            )
+            self.assertEqual(values, [[1, 2, 3]] * 100)
+
+            # replies completed by the executor are sent in batches
+            values = await adbus.client.call_many(
+                    self.service, [
+                            (
+                                    "adbus.test", "/adbus/test/Tests1",
+                                    "adbus.test", "TestMethod", (i, "abc"), "x"
+                            ) for i in range(200)
+                    ]
+            )
+            self.assertEqual(values, [i + 3 for i in range(200)])
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_process_budget(self):
+
+        async def call_basic():
+            get = (
+                    "adbus.test", "/adbus/test/Tests1",
+                    "org.freedesktop.DBus.Properties", "Get",
+                    ("adbus.test", "Property3"), "v"
+            )
+            self.service.set_process_budget(1)
+            try:
+                hits = self.service.process_stats()['budget_hits']
+                values = await adbus.client.call_many(self.service, [get] * 50)
+                self.assertEqual(values, [[1, 2, 3]] * 50)
+                self.assertGreater(
+                        self.service.process_stats()['budget_hits'], hits
+                )
+            finally:
+                self.service.set_process_budget(None)
+
+        self.loop.run_until_complete(call_basic())
+
     def test_get(self):
 
         async def call_basic():
@@ -113,6 +372,185 @@ class Test(unittest.TestCase):
 
         self.loop.run_until_complete(asyncio.gather(call_basic(), ))
 
+    def test_call_array_type(self):
+
+        async def call_basic():
+            for array_type in (list, bytes, memoryview, array.array):
+                value = await adbus.client.call(
+                        self.service,
+                        "adbus.test",
+                        "/adbus/test/Tests1",
+                        "org.freedesktop.DBus.Properties",
+                        "Get",
+                        args=("adbus.test", "Property3"),
+                        response_signature="v",
+                        array_type=array_type,
+                )
+                self.assertIsInstance(value, array_type)
+                if array_type is bytes:
+                    value = array.array('q', value)
+                self.assertEqual(list(value), [1, 2, 3])
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_call_numpy(self):
+
+        async def call_basic():
+            value = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "org.freedesktop.DBus.Properties",
+                    "Get",
+                    args=("adbus.test", "Property3"),
+                    response_signature="v",
+                    array_type=numpy.ndarray,
+            )
+            self.assertIsInstance(value, numpy.ndarray)
+            self.assertEqual(value.tolist(), [1, 2, 3])
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_call_lazy(self):
+
+        async def call_basic():
+            args = ("adbus.test", )
+            value = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "org.freedesktop.DBus.Properties",
+                    "GetAll",
+                    args=args,
+                    response_signature="a{sv}",
+            )
+            view = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "org.freedesktop.DBus.Properties",
+                    "GetAll",
+                    args=args,
+                    response_signature="a{sv}",
+                    lazy=True,
+            )
+            self.assertIsInstance(view, adbus.sdbus.MessageDict)
+            self.assertEqual(len(view), len(value))
+            self.assertEqual(list(view.keys()), list(value.keys()))
+            self.assertEqual(view["Property3"], value["Property3"])
+            self.assertEqual(view.materialize(), value)
+
+            def plain(v):
+                if isinstance(v, adbus.sdbus.MessageView):
+                    return v.materialize()
+                if isinstance(v, tuple):
+                    return tuple(plain(f) for f in v)
+                return v
+
+            # in order carries on from the last access, out of order and
+            # after reading nested views starts from the beginning
+            for keys in (list(value), list(reversed(value))):
+                view = await adbus.client.call(
+                        self.service,
+                        "adbus.test",
+                        "/adbus/test/Tests1",
+                        "org.freedesktop.DBus.Properties",
+                        "GetAll",
+                        args=args,
+                        response_signature="a{sv}",
+                        lazy=True,
+                )
+                for k in keys:
+                    self.assertEqual(plain(view[k]), value[k])
+
+            value = await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "StrListMethod"
+            )
+            view = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "StrListMethod",
+                    lazy=True
+            )
+            self.assertIsInstance(view, adbus.sdbus.MessageList)
+            for i in [0, 1, 2, 1, 0, 2]:
+                self.assertEqual(view[i], value[i])
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_unix_fd(self):
+
+        async def call_basic():
+            fd = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "MemfdMethod",
+                    args=("payload", ),
+                    response_signature="h",
+            )
+            self.assertIsInstance(fd, adbus.datatypes.UnixFd)
+            with adbus.datatypes.Memfd(fd) as memfd:
+                self.assertEqual(bytes(memfd.map()), b"payload")
+            fd.close()
+
+            memfd = adbus.datatypes.Memfd.create(bytes(range(256)) * 4096)
+            length = await adbus.client.call(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "MemfdLength",
+                    args=(memfd, ),
+                    response_signature="x",
+            )
+            self.assertEqual(length, 256 * 4096)
+            memfd.close()
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_get_coalesce(self):
+
+        async def call_basic():
+            values = await asyncio.gather(
+                    *[
+                            adbus.client.get(
+                                    self.service,
+                                    "adbus.test",
+                                    "/adbus/test/Tests1",
+                                    "adbus.test",
+                                    "Property3",
+                                    coalesce=True,
+                            ) for _ in range(10)
+                    ]
+            )
+            self.assertEqual(values, [[1, 2, 3]] * 10)
+            self.assertTrue(all(v is values[0] for v in values))
+
+        self.loop.run_until_complete(asyncio.gather(call_basic(), ))
+
+    def test_get_snapshot(self):
+
+        async def get_basic():
+            get = (
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "SnapshotProperty"
+            )
+            self.assertEqual(await adbus.client.get(*get), [1, 2, 3])
+            self.assertEqual(await adbus.client.get(*get), [1, 2, 3])
+            await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "ExtendSnapshot", (4, )
+            )
+            self.assertEqual(await adbus.client.get(*get), [1, 2, 3, 4])
+
+        self.loop.run_until_complete(get_basic())
+
     def test_get_all(self):
 
         async def call_basic():
@@ -215,6 +653,327 @@ class Test(unittest.TestCase):
 
         self.loop.run_until_complete(self.delay(30), )
 
+    def test_coalesced_properties(self):
+        changes = []
+
+        async def test_cb(
+                interface: str, changed: typing.Dict[str, typing.Any],
+                invalidated: typing.List[str]
+        ):
+            changes.append(changed)
+
+        async def set_all():
+            await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1/Coalesced",
+                    "adbus.test", "SetAll", (7, )
+            )
+            await asyncio.sleep(0.5)
+
+        listen = adbus.client.Listen(
+                self.service, "adbus.test", "/adbus/test/Tests1/Coalesced",
+                "org.freedesktop.DBus.Properties", "PropertiesChanged", test_cb
+        )
+        self.loop.run_until_complete(set_all())
+        del listen
+
+        self.assertEqual(changes, [{'First': 7, 'Second': 7, 'Third': 7}])
+
+    def test_property_delta(self):
+        deltas = []
+
+        async def test_cb(
+                version: int, changed: typing.Dict[str, int],
+                removed: typing.List[str]
+        ):
+            deltas.append((changed, removed))
+
+        async def update():
+            await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "UpdateTable", ("c", 3)
+            )
+            await asyncio.sleep(0.5)
+
+        listen = adbus.client.Listen(
+                self.service, "adbus.test", "/adbus/test/Tests1", "adbus.test",
+                "DeltaTableDelta", test_cb
+        )
+        self.loop.run_until_complete(update())
+        del listen
+
+        self.assertEqual(deltas, [({'c': 3}, ['a'])])
+
+    def test_signal_subscribe(self):
+
+        async def burst(count):
+            await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "EmitBurst", (count, )
+            )
+
+        async def read(listen, count):
+            return [(await listen.__anext__())[0] for _ in range(count)]
+
+        async def _test():
+            # without a maxsize signals are never dropped
+            listen = adbus.client.Listen(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "Signal2",
+                    None,
+                    maxsize=0
+            )
+            await burst(100)
+            await asyncio.sleep(0.2)
+            self.assertEqual(await read(listen, 100), list(range(100)))
+            self.assertEqual(listen.dropped, 0)
+            listen.close()
+
+            with self.assertRaises(ValueError):
+                adbus.client.SignalQueue(self.service, overflow='block')
+
+            # readers waiting at once get signals in turn
+            listen = adbus.client.Listen(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "Signal2", None
+            )
+            readers = asyncio.gather(read(listen, 5), read(listen, 5))
+            await burst(10)
+            first, second = await asyncio.wait_for(readers, 5)
+            self.assertEqual(sorted(first + second), list(range(10)))
+            listen.close()
+
+            listen = adbus.client.Listen(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "Signal2",
+                    None,
+                    maxsize=8,
+                    overflow='drop-oldest'
+            )
+            reported = []
+            self.loop.set_exception_handler(
+                    lambda loop, context: reported.append(context['message'])
+            )
+            try:
+                await burst(100)
+                await asyncio.sleep(0.2)
+            finally:
+                self.loop.set_exception_handler(None)
+            self.assertEqual(await read(listen, 8), list(range(92, 100)))
+            self.assertEqual(listen.dropped, 92)
+            # only the first signal dropped is reported
+            self.assertEqual(
+                    reported, [
+                            "Signal queue for Signal2 is full (maxsize 8),"
+                            " dropping signals with drop-oldest"
+                    ]
+            )
+            listen.close()
+
+            listen = adbus.client.Listen(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "Signal2",
+                    None,
+                    maxsize=8,
+                    overflow='drop-newest'
+            )
+            await burst(100)
+            await asyncio.sleep(0.2)
+            self.assertEqual(await read(listen, 8), list(range(8)))
+            self.assertEqual(listen.dropped, 92)
+            listen.close()
+
+            listen = adbus.client.Listen(
+                    self.service,
+                    "adbus.test",
+                    "/adbus/test/Tests1",
+                    "adbus.test",
+                    "Signal2",
+                    None,
+                    maxsize=8,
+                    overflow='keep-latest',
+                    key=lambda args: args[0] % 4
+            )
+            await burst(100)
+            await asyncio.sleep(0.2)
+            self.assertEqual(await read(listen, 4), [96, 97, 98, 99])
+            self.assertEqual(listen.dropped, 96)
+            listen.close()
+
+        self.loop.run_until_complete(_test())
+
+    def test_signal_sequential(self):
+        proxy = adbus.client.Proxy(
+                self.service, "adbus.test", "/adbus/test/Tests1", "adbus.test"
+        )
+        values = []
+
+        async def test_cb(value: int):
+            await asyncio.sleep(0.001)
+            values.append(value)
+
+        async def _test():
+            await proxy.update()
+            proxy.signal2.add(test_cb, sequential=True)
+            subscription = proxy.signal2.subscribe()
+            await proxy.emit_burst(50)
+            await asyncio.sleep(0.5)
+            proxy.signal2.remove(test_cb)
+
+            received = [(await subscription.__anext__())[0] for _ in range(50)]
+            subscription.close()
+            return received
+
+        received = self.loop.run_until_complete(_test())
+        self.assertEqual(values, list(range(50)))
+        self.assertEqual(received, list(range(50)))
+
+    def test_signal_router(self):
+        service = adbus.Service(bus='session', route_signals=True)
+        received = {
+                'a': [],
+                'b': [],
+                'c': [],
+                'changed': [],
+                'other': [],
+                'bad': [],
+                'any': []
+        }
+
+        def listen(
+                service,
+                member,
+                name,
+                args=(),
+                signature=None,
+                address="adbus.test"
+        ):
+
+            async def test_cb(values):
+                received[name].append(values[0])
+
+            return adbus.client.Listen(
+                    service,
+                    address,
+                    "/adbus/test/Tests1",
+                    "adbus.test"
+                    if not args else "org.freedesktop.DBus.Properties",
+                    member,
+                    test_cb,
+                    args=args,
+                    signature=signature
+            )
+
+        async def _test():
+            rules = self.service.signal_stats()['rules']
+            shared = [listen(self.service, "Signal2", 'a') for _ in range(2)]
+            self.assertEqual(self.service.signal_stats()['rules'], rules + 1)
+            del shared
+            self.assertEqual(self.service.signal_stats()['rules'], rules)
+
+            listens = [
+                    # can't read the signal, but doesn't stop the others
+                    listen(service, "Signal2", 'bad', signature='s'),
+                    listen(service, "Signal2", 'a'),
+                    listen(service, "Signal2", 'b'),
+                    listen(service, "Signal1", 'c'),
+                    listen(
+                            service, "PropertiesChanged", 'changed',
+                            ("adbus.test", )
+                    ),
+                    listen(
+                            service, "PropertiesChanged", 'other',
+                            ("adbus.other", )
+                    ),
+                    listen(service, "Signal2", 'any', address=None),
+            ]
+            self.assertEqual(
+                    service.signal_stats(), {
+                            'rules': 2,
+                            'listens': 7
+                    }
+            )
+
+            await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "EmitBurst", (5, )
+            )
+            await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "UpdateTable", ("router", 1)
+            )
+            await asyncio.sleep(0.5)
+
+            del listens
+            self.assertEqual(service.signal_stats()['rules'], 0)
+
+        self.loop.run_until_complete(_test())
+
+        self.assertEqual(received['a'], list(range(5)))
+        self.assertEqual(received['b'], list(range(5)))
+        self.assertEqual(received['bad'], [])
+        self.assertEqual(received['any'], list(range(5)))
+        self.assertEqual(received['c'], [])
+        self.assertEqual(received['changed'], ["adbus.test"])
+        self.assertEqual(received['other'], [])
+
+    def test_signal_lazy(self):
+        views = []
+
+        async def test_cb(values: typing.List[str]):
+            views.append(values)
+
+        async def _test():
+            listens = [
+                    adbus.client.Listen(
+                            self.service,
+                            "adbus.test",
+                            "/adbus/test/Tests1",
+                            "adbus.test",
+                            "SignalList",
+                            test_cb,
+                            lazy=True
+                    ) for _ in range(2)
+            ]
+
+            await adbus.client.call(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "EmitList", (10, )
+            )
+            await asyncio.sleep(0.5)
+            del listens
+
+        self.loop.run_until_complete(_test())
+
+        # both views read the same message, interleaved
+        a, b = views
+        self.assertEqual(
+                [a[1], b[2], a[2], b[3], a[3], b[9], a[4]],
+                ["1", "2", "2", "3", "3", "9", "4"]
+        )
+
+    def test_proxy_cast(self):
+        proxy = adbus.client.Proxy(
+                self.service, "adbus.test", "/adbus/test/Tests1", "adbus.test"
+        )
+
+        async def _test():
+            await proxy.update()
+
+            # arguments that aren't the declared types are cast to them
+            self.assertEqual(await proxy.test_method(100, 5), 101)
+            self.assertEqual(await proxy.join_strings([1, 2]), "1,2")
+
+        self.loop.run_until_complete(_test())
+
     def test_proxy_props(self):
         proxy = adbus.client.Proxy(
                 self.service, "adbus.test", "/adbus/test/Tests1", "adbus.test"
@@ -224,6 +983,11 @@ class Test(unittest.TestCase):
             await proxy.update()
 
             print(await proxy.test_method(100, "crud"))
+            self.assertEqual(
+                    await
+                    proxy.call_many([("test_method", (100, "crud"))] * 3),
+                    [104] * 3
+            )
             print(await proxy.property1.get())
             await proxy.property1.set(self.rnd_str())
             print(await proxy.property1())
@@ -234,6 +998,68 @@ class Test(unittest.TestCase):
 
         self.loop.run_until_complete(_test())
 
+    def test_proxy_delta(self):
+        proxy = adbus.client.Proxy(
+                self.service, "adbus.test", "/adbus/test/Tests1", "adbus.test"
+        )
+        deltas = []
+
+        async def tracker(delta):
+            deltas.append(delta)
+
+        async def update(key, value):
+            await proxy.update_table(key, value)
+            await asyncio.sleep(0.2)
+            self.assertEqual(
+                    await proxy.delta_table.get(), await adbus.client.get(
+                            self.service, "adbus.test", "/adbus/test/Tests1",
+                            "adbus.test", "DeltaTable"
+                    )
+            )
+
+        async def _test():
+            await proxy.update()
+            proxy.delta_table.track(tracker, delta=True)
+
+            # GetAll doesn't send the value again with its version, so
+            # the first delta re-reads it with its version
+            values = await adbus.client.get_all(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test"
+            )
+            self.assertIn("DeltaTable", values)
+            self.assertNotIn("DeltaTableVersioned", values)
+            self.assertIsNone(proxy.delta_table.version)
+            await update("proxy", 1)
+            self.assertIsInstance(deltas[-1], dict)
+
+            version, value = await adbus.client.get(
+                    self.service, "adbus.test", "/adbus/test/Tests1",
+                    "adbus.test", "DeltaTableVersioned"
+            )
+            self.assertEqual(await proxy.delta_table.get(), value)
+            self.assertEqual(proxy.delta_table.version, version)
+
+            await update("d", 4)
+            self.assertIsInstance(deltas[-1], adbus.client.PropertyDelta)
+            self.assertEqual(deltas[-1].changed, {"d": 4})
+
+            # a missed delta re-reads the whole value
+            proxy.delta_table.version -= 1
+            await update("e", 5)
+            self.assertIsInstance(deltas[-1], dict)
+            self.assertEqual(deltas[-1]["e"], 5)
+
+            # changed in place on the server, so there's no delta
+            await proxy.update_table_in_place("f", 6)
+            await asyncio.sleep(0.2)
+            self.assertIsInstance(deltas[-1], dict)
+            self.assertEqual(deltas[-1]["f"], 6)
+            await update("g", 7)
+            self.assertEqual(deltas[-1].changed, {"g": 7})
+
+        self.loop.run_until_complete(_test())
+
     def test_proxy_signal(self):
         proxy = adbus.client.Proxy(
                 self.service, "adbus.test", "/adbus/test/Tests1", "adbus.test"
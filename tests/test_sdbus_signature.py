@@ -5,6 +5,7 @@
 
 import unittest
 import typing
+import array
 from adbus.sdbus import dbus_signature
 
 
@@ -39,6 +40,36 @@ class Test(unittest.TestCase):
         with self.assertRaises(TypeError):
             dbus_signature(Test)
 
+    def test_types_cached(self):
+        t = typing.Dict[str, typing.List[typing.Tuple[int, str]]]
+        self.assertEqual(dbus_signature(t), "a{sa(xs)}")
+        self.assertEqual(dbus_signature(t), "a{sa(xs)}")
+
+        with self.assertRaises(TypeError):
+            dbus_signature(Test)
+
+    def test_lists(self):
+        sig = dbus_signature([1, 'a', 2.0])
+        self.assertEqual(sig, "(xsd)")
+
+        sig = dbus_signature(list(range(100000)))
+        self.assertEqual(sig, "ax")
+
+        # every element of a long list is checked
+        values = list(range(200))
+        values[100] = 'a'
+        sig = dbus_signature(values)
+        self.assertEqual(sig, "(" + "x" * 100 + "s" + "x" * 99 + ")")
+
+        sig = dbus_signature(array.array('i', [1, 2, 3]))
+        self.assertEqual(sig, "ai")
+
+        sig = dbus_signature(array.array('B', b'123'))
+        self.assertEqual(sig, "ay")
+
+        sig = dbus_signature(array.array('d', [1.0]))
+        self.assertEqual(sig, "ad")
+
 
 if __name__ == "__main__":
     unittest.main()
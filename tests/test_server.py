@@ -5,6 +5,7 @@
 
 import unittest
 import asyncio
+import concurrent.futures
 import asyncio.subprocess
 import typing
 import time
@@ -33,11 +34,27 @@ class _TestObect:
     dbus_value = '/this/is/nothing'
 
 
+class _TestBytes:
+    dbus_signature = 'ay'
+
+
+_process_pool = concurrent.futures.ProcessPoolExecutor(1)
+
+
 class TestObject(adbus.server.Object):
 
     property1: str = adbus.server.Property('propertystring')
     property2: int = adbus.server.Property(100, emits_change=False)
     property3: typing.List[int] = adbus.server.Property([1, 2, 3])
+    snapshot_property: typing.List[int] = adbus.server.Property(
+            [1, 2, 3], snapshot=True
+    )
+    delta_table: typing.Dict[str, int] = adbus.server.Property(
+            {
+                    'a': 1,
+                    'b': 2
+            }, change_detection='hash', delta=True
+    )
     datatype: TestDataType = adbus.server.Property(TestDataType(6))
 
     complex_type1: typing.Dict[str, str] = adbus.server.Property(
@@ -53,6 +70,7 @@ class TestObject(adbus.server.Object):
     signal1: (int, str) = adbus.server.Signal()
     signal2: int = adbus.server.Signal()
     signal_cnt: int = adbus.server.Signal()
+    signal_list: typing.List[str] = adbus.server.Signal()
 
     def __init__(self, service):
         super().__init__(
@@ -65,6 +83,19 @@ class TestObject(adbus.server.Object):
     def str_list_method(self) -> typing.List[str]:
         return ['thisisthefirst', 'two', 'three']
 
+    @adbus.server.method()
+    def byte_array_method(self) -> _TestBytes:
+        return b'\x01\x02\x03'
+
+    @adbus.server.method()
+    def memfd_method(self, data: str) -> adbus.datatypes.UnixFd:
+        return adbus.datatypes.Memfd.create(data.encode())
+
+    @adbus.server.method()
+    def memfd_length(self, fd: adbus.datatypes.UnixFd) -> int:
+        with adbus.datatypes.Memfd(fd) as memfd:
+            return len(memfd.map())
+
     @adbus.server.method()
     def simple_method(self) -> int:
         return 1000
@@ -73,10 +104,88 @@ class TestObject(adbus.server.Object):
     def test_method(self, r: int, gg: str) -> int:
         return r + len(gg)
 
+    @adbus.server.method()
+    def join_strings(self, values: typing.List[str]) -> str:
+        return ','.join(values)
+
     @adbus.server.method(name="DifferentName", deprecated=True)
     def test_method2(self, r: int, gg: str) -> int:
         return r + 10 * len(gg)
 
+    @adbus.server.method()
+    async def async_method(self, r: int, gg: str) -> int:
+        await asyncio.sleep(0.01)
+        return r + 2 * len(gg)
+
+    @adbus.server.method()
+    async def async_error(self) -> str:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("Async Test")
+
+    @adbus.server.method(inline=True)
+    def inline_method(self, r: int, gg: str) -> int:
+        return r + 3 * len(gg)
+
+    @adbus.server.method()
+    def bad_return(self) -> int:
+        return "not an int"
+
+    @adbus.server.method()
+    async def async_bad_return(self) -> int:
+        await asyncio.sleep(0.01)
+        return "not an int"
+
+    @adbus.server.method(inline=True)
+    def inline_bad_return(self) -> int:
+        return "not an int"
+
+    @adbus.server.method(inline=True)
+    def pending_methods(self) -> int:
+        return self.service.method_stats()['pending']
+
+    @adbus.server.method(concurrency=1, queue_limit=1)
+    def limited_method(self) -> int:
+        time.sleep(0.5)
+        return 1
+
+    @adbus.server.method(threadsafe=False)
+    def serial_method(self) -> int:
+        self.serial_active = getattr(self, 'serial_active', 0) + 1
+        active = self.serial_active
+        time.sleep(0.05)
+        self.serial_active -= 1
+        return active
+
+    @adbus.server.method(executor=_process_pool)
+    @staticmethod
+    def process_method(name: str) -> str:
+        return name + current_process().name
+
+    @adbus.server.method()
+    def extend_snapshot(self, value: int) -> None:
+        self.snapshot_property = self.snapshot_property + [value]
+
+    @adbus.server.method()
+    def update_table(self, key: str, value: int) -> None:
+        table = dict(self.delta_table)
+        table.pop('a', None)
+        table[key] = value
+        self.delta_table = table
+
+    @adbus.server.method()
+    def update_table_in_place(self, key: str, value: int) -> None:
+        self.delta_table[key] = value
+        TestObject.__dict__['delta_table'].emit_changed(self)
+
+    @adbus.server.method()
+    async def emit_burst(self, count: int) -> None:
+        for i in range(count):
+            self.signal2 = i
+
+    @adbus.server.method()
+    def emit_list(self, count: int) -> None:
+        self.signal_list = [str(i) for i in range(count)]
+
     @adbus.server.method()
     def slow_method(self) -> str:
         for _ in range(0, 5):
@@ -121,6 +230,28 @@ class TestObject(adbus.server.Object):
         return "/this/is/nothing"
 
 
+class CoalescedObject(adbus.server.Object):
+
+    first: int = adbus.server.Property(0)
+    second: int = adbus.server.Property(0)
+    third: int = adbus.server.Property(0)
+
+    def __init__(self, service):
+        super().__init__(
+                service,
+                object_path + '/Coalesced',
+                object_interface,
+                coalesce_window=0.05,
+                coalesce_max_delay=0.2
+        )
+
+    @adbus.server.method()
+    def set_all(self, value: int) -> None:
+        self.first = value
+        self.second = value
+        self.third = value
+
+
 class Test(unittest.TestCase):
     """adbus method test cases."""
 
@@ -134,6 +265,7 @@ class Test(unittest.TestCase):
                 allow_replacement=True
         )
         cls.obj = TestObject(cls.service)
+        cls.coalesced = CoalescedObject(cls.service)
 
     @staticmethod
     async def delay(loops=10):
@@ -173,6 +305,42 @@ class Test(unittest.TestCase):
                 )
         )
 
+    def test_method_async(self):
+        self.loop.run_until_complete(
+                self.call_method(
+                        "AsyncMethod", "xs", [-100, "doggie"], 'x', -88
+                )
+        )
+
+    def test_method_inline(self):
+        self.loop.run_until_complete(
+                self.call_method(
+                        "InlineMethod", "xs", [-100, "doggie"], 'x', -82
+                )
+        )
+
+        def callback(self) -> int:
+            return 1
+
+        async def coroutine(self) -> int:
+            return 1
+
+        # combinations that would block the loop, or be ignored
+        with self.assertRaises(ValueError):
+            adbus.server.Method(callback, inline=True, threadsafe=False)
+        with self.assertRaises(ValueError):
+            adbus.server.Method(callback, inline=True, concurrency=1)
+        with self.assertRaises(ValueError):
+            adbus.server.Method(coroutine, threadsafe=False)
+        with self.assertRaises(ValueError):
+            adbus.server.Method(
+                    callback, executor=_process_pool, threadsafe=False
+            )
+        with self.assertRaises(ValueError):
+            adbus.server.Method(callback, executor=_process_pool, inline=True)
+        with self.assertRaises(ValueError):
+            adbus.server.Method(coroutine, executor=_process_pool)
+
     def test_str_list(self):
         self.loop.run_until_complete(
                 self.call_method(
@@ -181,6 +349,11 @@ class Test(unittest.TestCase):
                 )
         )
 
+    def test_byte_array(self):
+        self.loop.run_until_complete(
+                self.call_method("ByteArrayMethod", "", [''], 'ay', '3 1 2 3')
+        )
+
     def test_method_rename(self):
         self.loop.run_until_complete(
                 self.call_method(
@@ -228,6 +401,21 @@ class Test(unittest.TestCase):
 
         self.loop.run_until_complete(set_props(self.obj))
 
+    def test_property_change_detection(self):
+        prop = TestObject.__dict__['delta_table']
+        version = prop.version(self.obj)
+
+        self.obj.delta_table = dict(self.obj.delta_table)
+        self.assertEqual(prop.version(self.obj), version)
+
+        self.obj.delta_table = dict(self.obj.delta_table, z=26)
+        self.assertEqual(prop.version(self.obj), version + 1)
+
+        # changed in place
+        self.obj.delta_table['y'] = 25
+        prop.emit_changed(self.obj)
+        self.assertEqual(prop.version(self.obj), version + 2)
+
     def test_signal(self):
 
         async def set_signal(obj):
@@ -237,6 +425,21 @@ class Test(unittest.TestCase):
 
         self.loop.run_until_complete(set_signal(self.obj))
 
+    def test_signal_drain(self):
+
+        async def emit_signals(obj):
+            self.service.set_write_limits(16, 0)
+            try:
+                for i in range(2000):
+                    obj.signal2 = i
+                    await self.service.drain()
+                    self.assertLessEqual(self.service.n_queued_write(), 16)
+                await self.service.drain()
+            finally:
+                self.service.set_write_limits(1024)
+
+        self.loop.run_until_complete(emit_signals(self.obj))
+
 
 if __name__ == "__main__":
     unittest.main()